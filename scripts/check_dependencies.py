@@ -4,22 +4,41 @@
 检查项目所需的依赖是否已安装
 """
 
+import os
+import re
 import subprocess
 import sys
+from importlib import metadata
 from pathlib import Path
 
 
+# 核心依赖（发行包名称）
+CORE_DEPENDENCIES = (
+    "browser-use",
+    "playwright",
+    "langchain-openai",
+    "fastapi",
+    "uvicorn",
+    "typer",
+    "pydantic",
+    "structlog",
+    "jinja2",
+    "pyyaml",
+    "python-dotenv",
+)
+
+
 def check_python_version():
     """检查Python版本"""
     print("🐍 检查Python版本...")
     
     version = sys.version_info
-    if version.major == 3 and version.minor >= 11:
+    ok = version >= (3, 11)
+    if ok:
         print(f"✅ Python {version.major}.{version.minor}.{version.micro}")
-        return True
     else:
         print(f"❌ Python {version.major}.{version.minor}.{version.micro} (需要Python 3.11+)")
-        return False
+    return ok
 
 
 def check_virtual_env():
@@ -34,17 +53,30 @@ def check_virtual_env():
         return False
 
 
-def check_package(package_name, import_name=None):
-    """检查单个包是否安装"""
-    if import_name is None:
-        import_name = package_name.replace('-', '_')
+def _canonical_name(name):
+    """规范化发行包名称（PEP 503）"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def installed_distributions():
+    """一次性扫描已安装的发行包，返回规范化名称集合"""
+    names = set()
+    for dist in metadata.distributions():
+        name = dist.metadata["Name"]
+        if name:
+            names.add(_canonical_name(name))
+    return names
+
+
+def check_package(package_name, installed=None):
+    """检查单个包是否安装（只读取dist-info元数据，不导入模块）"""
+    if installed is not None:
+        return _canonical_name(package_name) in installed
     
     try:
-        __import__(import_name)
-        print(f"✅ {package_name}")
+        metadata.distribution(package_name)
         return True
-    except ImportError:
-        print(f"❌ {package_name}")
+    except metadata.PackageNotFoundError:
         return False
 
 
@@ -52,30 +84,27 @@ def check_core_dependencies():
     """检查核心依赖"""
     print("\n📦 检查核心依赖...")
     
-    dependencies = [
-        ("browser-use", "browser_use"),
-        ("playwright", "playwright"),
-        ("langchain-openai", "langchain_openai"),
-        ("fastapi", "fastapi"),
-        ("uvicorn", "uvicorn"),
-        ("typer", "typer"),
-        ("pydantic", "pydantic"),
-        ("structlog", "structlog"),
-        ("jinja2", "jinja2"),
-        ("pyyaml", "yaml"),
-        ("python-dotenv", "dotenv"),
-    ]
+    # 单次目录扫描即可完成全部依赖的查找
+    installed = installed_distributions()
     
+    # 统一输出，保证结果顺序稳定
+    lines = []
     missing = []
-    for package, import_name in dependencies:
-        if not check_package(package, import_name):
+    for package in CORE_DEPENDENCIES:
+        ok = check_package(package, installed)
+        lines.append(f"{'✅' if ok else '❌'} {package}")
+        if not ok:
             missing.append(package)
+    print("\n".join(lines))
     
     return missing
 
 
-def install_missing_packages(missing_packages):
-    """安装缺失的包"""
+def install_missing_packages(missing_packages, capture_output=False):
+    """安装缺失的包
+    
+    默认直接继承终端输出，实时显示pip安装进度；capture_output=True时捕获输出（用于测试）。
+    """
     if not missing_packages:
         return True
     
@@ -90,26 +119,78 @@ def install_missing_packages(missing_packages):
     try:
         print("\n📥 安装缺失的依赖...")
         
-        # 使用pip安装
-        cmd = [sys.executable, "-m", "pip", "install"] + missing_packages
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        # 使用pip一次性安装，优先使用预编译wheel，避免源码构建
+        cmd = [
+            sys.executable, "-m", "pip", "install",
+            "--prefer-binary",
+            "--disable-pip-version-check",
+            "--no-input",
+        ] + missing_packages
+        subprocess.run(cmd, check=True, capture_output=capture_output, text=capture_output)
         
         print("✅ 依赖安装完成")
         return True
         
     except subprocess.CalledProcessError as e:
         print(f"❌ 安装失败: {e}")
-        print(f"错误输出: {e.stderr}")
+        if e.stderr:
+            print(f"错误输出: {e.stderr}")
+        return False
+
+
+def _playwright_browsers_path():
+    """获取Playwright浏览器的默认安装目录"""
+    custom_path = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
+    if custom_path:
+        # "0" 表示浏览器安装在playwright包内部，无法直接定位
+        return None if custom_path == "0" else Path(custom_path)
+    
+    if sys.platform == "win32":
+        return Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")) / "ms-playwright"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "ms-playwright"
+    return Path.home() / ".cache" / "ms-playwright"
+
+
+def _chromium_installed():
+    """直接扫描浏览器目录判断Chromium是否已安装"""
+    root = _playwright_browsers_path()
+    if root is None:
+        return False
+    
+    try:
+        with os.scandir(root) as entries:
+            return any(entry.name.startswith("chromium-") and entry.is_dir() for entry in entries)
+    except OSError:
         return False
 
 
+def _playwright_cli(*args):
+    """构造Playwright CLI命令，优先直接调用驱动程序以省去Python解释器启动"""
+    try:
+        from playwright._impl._driver import compute_driver_executable, get_driver_env
+    except ImportError:
+        return [sys.executable, "-m", "playwright", *args], None
+    
+    driver = compute_driver_executable()
+    executable = list(driver) if isinstance(driver, tuple) else [driver]
+    return [*map(str, executable), *args], get_driver_env()
+
+
 def check_playwright_browsers():
     """检查Playwright浏览器"""
     print("\n🌐 检查Playwright浏览器...")
     
+    # 快速路径：浏览器目录已存在时无需启动子进程
+    if _chromium_installed():
+        print("✅ Playwright浏览器已安装")
+        return True
+    
     try:
+        cmd, env = _playwright_cli("install", "--dry-run")
         result = subprocess.run(
-            [sys.executable, "-m", "playwright", "install", "--dry-run"],
+            cmd,
+            env=env,
             capture_output=True,
             text=True,
             timeout=10
@@ -121,7 +202,8 @@ def check_playwright_browsers():
             response = input("是否安装Playwright浏览器？(y/N): ").strip().lower()
             if response == 'y':
                 print("📥 安装Playwright浏览器...")
-                subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"], check=True)
+                cmd, env = _playwright_cli("install", "chromium")
+                subprocess.run(cmd, env=env, check=True)
                 print("✅ Playwright浏览器安装完成")
                 return True
             else:
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """创建.env.example文件的脚本"""
+from pathlib import Path
 
-env_content = """# Browser-Use LLM配置
+ENV_CONTENT = """# Browser-Use LLM配置
 OPENAI_API_KEY=your_openai_api_key_here
 ANTHROPIC_API_KEY=your_claude_api_key_here
 
@@ -18,7 +19,6 @@ MAX_CONCURRENT_TASKS=10
 DEFAULT_TIMEOUT=30
 """
 
-with open('.env.example', 'w', encoding='utf-8') as f:
-    f.write(env_content)
+Path('.env.example').write_text(ENV_CONTENT, encoding='utf-8')
 
 print('✅ .env.example 创建成功') 
\ No newline at end of file
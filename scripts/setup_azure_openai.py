@@ -2,12 +2,35 @@
 """
 Azure OpenAI配置设置脚本
 帮助用户配置Azure OpenAI环境变量
+
+配置测试依赖项目代码，运行前需在项目根目录执行 `pip install -e .`。
 """
 
 import os
-import sys
 from pathlib import Path
 
+import click
+import typer
+
+# .env文件模板
+ENV_TEMPLATE = """# Azure OpenAI Configuration
+# 请填写您的Azure OpenAI配置信息
+
+# 必需配置
+AZURE_OPENAI_API_KEY=your-api-key-here
+AZURE_OPENAI_API_BASE=https://your-resource.openai.azure.com/
+
+# 可选配置（有默认值）
+AZURE_OPENAI_API_VERSION=2024-02-15-preview
+AZURE_OPENAI_DEPLOYMENT_NAME=gpt-4o
+AZURE_OPENAI_MODEL=gpt-4o
+
+# 其他配置
+# AZURE_OPENAI_DEPLOYMENT_NAME=gpt-4-turbo  # 如果使用GPT-4 Turbo
+# AZURE_OPENAI_MODEL=gpt-4-turbo  # 如果使用GPT-4 Turbo
+"""
+
+
 def check_current_config():
     """检查当前配置"""
     print("🔍 检查当前Azure OpenAI配置...")
@@ -39,23 +62,6 @@ def check_current_config():
 
 def create_env_file():
     """创建.env文件模板"""
-    env_template = """# Azure OpenAI Configuration
-# 请填写您的Azure OpenAI配置信息
-
-# 必需配置
-AZURE_OPENAI_API_KEY=your-api-key-here
-AZURE_OPENAI_API_BASE=https://your-resource.openai.azure.com/
-
-# 可选配置（有默认值）
-AZURE_OPENAI_API_VERSION=2024-02-15-preview
-AZURE_OPENAI_DEPLOYMENT_NAME=gpt-4o
-AZURE_OPENAI_MODEL=gpt-4o
-
-# 其他配置
-# AZURE_OPENAI_DEPLOYMENT_NAME=gpt-4-turbo  # 如果使用GPT-4 Turbo
-# AZURE_OPENAI_MODEL=gpt-4-turbo  # 如果使用GPT-4 Turbo
-"""
-    
     env_file = Path(".env")
     
     if env_file.exists():
@@ -66,8 +72,7 @@ AZURE_OPENAI_MODEL=gpt-4o
             return False
     
     try:
-        with open(env_file, 'w', encoding='utf-8') as f:
-            f.write(env_template)
+        env_file.write_text(ENV_TEMPLATE, encoding='utf-8')
         
         print(f"✅ .env文件已创建: {env_file.absolute()}")
         print("📝 请编辑.env文件，填写您的Azure OpenAI配置信息")
@@ -117,11 +122,6 @@ def test_configuration():
     print("\n🧪 测试Azure OpenAI配置...")
     
     try:
-        # 添加项目路径
-        project_root = Path(__file__).parent.parent
-        sys.path.insert(0, str(project_root))
-        sys.path.insert(0, str(project_root / "src"))
-        
         from src.core.config import config
         from src.core.recorder import create_azure_openai_llm
         
@@ -148,6 +148,35 @@ def test_configuration():
         return False
 
 
+def _print_env_var_commands():
+    """显示设置环境变量的命令"""
+    print("\n📋 请在终端中运行以下命令设置环境变量：")
+    print("export AZURE_OPENAI_API_KEY='your-api-key'")
+    print("export AZURE_OPENAI_API_BASE='https://your-resource.openai.azure.com/'")
+    print("export AZURE_OPENAI_DEPLOYMENT_NAME='gpt-4o'")
+    print("\n设置完成后，请重新运行此脚本验证配置。")
+
+
+def _create_env_file_and_hint():
+    """创建.env文件并提示后续操作"""
+    if create_env_file():
+        print("\n📝 请编辑.env文件，然后重新运行此脚本验证配置。")
+
+
+def _say_goodbye():
+    """退出"""
+    print("👋 再见！")
+
+
+# 菜单选项 -> 处理函数
+MENU_ACTIONS = {
+    "1": _print_env_var_commands,
+    "2": _create_env_file_and_hint,
+    "3": show_setup_instructions,
+    "4": _say_goodbye,
+}
+
+
 def main():
     """主函数"""
     print("🚀 Browser-Use-Playwright - Azure OpenAI配置工具")
@@ -178,32 +207,9 @@ def main():
     print("3. 查看配置说明")
     print("4. 退出")
     
-    while True:
-        choice = input("\n请输入选择 (1-4): ").strip()
-        
-        if choice == "1":
-            print("\n📋 请在终端中运行以下命令设置环境变量：")
-            print("export AZURE_OPENAI_API_KEY='your-api-key'")
-            print("export AZURE_OPENAI_API_BASE='https://your-resource.openai.azure.com/'")
-            print("export AZURE_OPENAI_DEPLOYMENT_NAME='gpt-4o'")
-            print("\n设置完成后，请重新运行此脚本验证配置。")
-            break
-            
-        elif choice == "2":
-            if create_env_file():
-                print("\n📝 请编辑.env文件，然后重新运行此脚本验证配置。")
-            break
-            
-        elif choice == "3":
-            show_setup_instructions()
-            break
-            
-        elif choice == "4":
-            print("👋 再见！")
-            break
-            
-        else:
-            print("❌ 无效选择，请输入1-4")
+    # click负责输入校验，无效输入会自动提示重新输入
+    choice = typer.prompt("\n请输入选择", type=click.Choice(list(MENU_ACTIONS)))
+    MENU_ACTIONS[choice]()
 
 
 if __name__ == "__main__":
@@ -1,17 +1,23 @@
 #!/usr/bin/env python3
-"""Web UI启动脚本"""
-import sys
-from pathlib import Path
+"""Web UI启动脚本
 
-# 添加项目根目录到Python路径
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+运行前需在项目根目录执行 `pip install -e .`，使 `src` 包可直接导入。
+"""
+import importlib.util
 
 # 导入并启动Web应用
 from src.web.app import app
 import uvicorn
 
+
+def _select_loop():
+    """优先使用uvloop事件循环，不可用时（如Windows）回退到asyncio"""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
 if __name__ == "__main__":
+    loop = _select_loop()
     print("启动Browser-Use-Playwright Web UI")
     print("地址: http://127.0.0.1:8000")
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    print(f"事件循环: {loop}")
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop=loop)
@@ -0,0 +1,11 @@
+"""项目路径常量
+
+在模块导入时计算一次，供各模块复用，避免重复构造 Path(__file__).parent... 对象。
+"""
+from pathlib import Path
+
+# 项目根目录
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# 脚本目录
+SCRIPTS_DIR = PROJECT_ROOT / "scripts"
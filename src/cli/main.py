@@ -6,16 +6,8 @@ from typing import Optional
 
 import typer
 from rich.console import Console
-from rich.table import Table
 
-# 添加项目根目录到Python路径以支持绝对导入
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
-from src.core.config import config
-from src.core.recorder import WorkflowRecorder
-from src.utils.logger import logger
-from .record import record_command, list_command, show_command
+# 重量级模块（配置、录制器、日志等）在各命令内部按需导入，以缩短CLI启动时间
 
 app = typer.Typer(name="browser-use-playwright", help="Browser-Use + Playwright RPA自动化框架")
 console = Console()
@@ -28,6 +20,8 @@ app.add_typer(record_app, name="record")
 @app.command()
 def version():
     """显示版本信息"""
+    from src.core.config import config
+    
     console.print(f"[bold green]Browser-Use-Playwright[/bold green] v{config.app.version}")
     console.print("Browser-AI RPA Starter - 录制、执行、自愈")
 
@@ -35,6 +29,10 @@ def version():
 @app.command()
 def list():
     """列出所有工作流"""
+    from rich.table import Table
+    
+    from src.core.recorder import WorkflowRecorder
+    
     try:
         recorder = WorkflowRecorder()
         workflows = recorder.list_workflows()
@@ -69,9 +67,10 @@ def list():
 @app.command()
 def show(workflow_name: str):
     """显示工作流详情"""
+    from src.core.recorder import load_workflow_cached
+    
     try:
-        recorder = WorkflowRecorder()
-        workflow = recorder.load_workflow(workflow_name)
+        workflow = load_workflow_cached(workflow_name)
         
         if not workflow:
             console.print(f"[red]工作流 '{workflow_name}' 不存在[/red]")
@@ -133,7 +132,9 @@ def record_douban_book():
     
     try:
         # 直接调用测试函数，避免导入问题
-        sys.path.insert(0, str(project_root / "scripts"))
+        from src._paths import SCRIPTS_DIR
+        
+        sys.path.insert(0, str(SCRIPTS_DIR))
         
         # 导入并运行测试函数
         import test_douban_book_search
@@ -154,25 +155,32 @@ def record_douban_book():
             sys.exit(1)
             
     except Exception as e:
+        from src.utils.logger import logger
+        
         console.print(f"[red]录制失败: {e}[/red]")
         logger.error("豆瓣图书搜索录制失败", error=str(e))
         sys.exit(1)
 
 
 @app.command()
-def web():
+def web(
+    reload: bool = typer.Option(False, "--reload", help="代码变更时自动重载"),
+):
     """启动Web UI界面"""
     try:
         console.print("[bold blue]🌐 启动Web UI界面...[/bold blue]")
         console.print("📝 地址: http://localhost:8000")
         
-        # 启动Web UI
-        import subprocess
-        import sys
-        from pathlib import Path
+        # 在当前进程内直接启动Web UI，避免再启动一个Python解释器
+        import uvicorn
         
-        script_path = Path(__file__).parent.parent.parent / "scripts" / "start_web_ui.py"
-        subprocess.run([sys.executable, str(script_path)])
+        if reload:
+            # 重载模式需要以导入字符串的形式传入应用
+            uvicorn.run("src.web.app:app", host="0.0.0.0", port=8000, reload=True)
+        else:
+            from src.web.app import app as web_app
+            
+            uvicorn.run(web_app, host="0.0.0.0", port=8000)
         
     except KeyboardInterrupt:
         console.print("\n[yellow]Web UI已停止[/yellow]")
@@ -206,10 +214,16 @@ def batch(
     timeout: int = typer.Option(30, "--timeout", "-t", help="超时时间(秒)"),
     output_dir: Optional[Path] = typer.Option(None, "--output-dir", "-o", help="结果输出目录"),
     continue_on_error: bool = typer.Option(True, "--continue-on-error/--stop-on-error", help="遇到错误是否继续"),
+    compact: bool = typer.Option(True, "--compact/--pretty", help="单次执行结果文件是否使用紧凑JSON格式"),
 ):
-    """批量执行工作流"""
+    """批量执行工作流
+
+    所有任务共用一个浏览器进程，每个任务在独立的浏览器上下文中执行。
+    用户数据目录（Chrome Profile）不会直接打开，只导出其中的Cookie和本地存储作为每个任务的初始状态；
+    依赖IndexedDB、Service Worker等其他Profile数据的工作流请使用 run 单独执行。
+    """
     from src.cli.run import batch_run
-    batch_run(workflow_name, data_file, concurrent, headless, timeout, output_dir, continue_on_error)
+    batch_run(workflow_name, data_file, concurrent, headless, timeout, output_dir, continue_on_error, compact)
 
 
 @app.command()
@@ -1,5 +1,7 @@
 """录制命令实现"""
 import asyncio
+import threading
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional
 
@@ -8,13 +10,44 @@ from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
 
-from ..core.recorder import WorkflowRecorder
+from ..core.recorder import WorkflowRecorder, clear_workflow_cache, load_workflow_cached
 from ..utils.cleaner import ScriptCleaner
+from ..utils.event_loop import run_async
 from ..utils.logger import logger
 
 console = Console()
 
 
+def _resolve(future: asyncio.Future) -> None:
+    """在事件循环线程中完成future（等待已被取消时忽略）"""
+    if not future.done():
+        future.set_result(None)
+
+
+async def _wait_for_enter() -> None:
+    """等待用户按Enter键，不阻塞事件循环
+    
+    input()在守护线程中执行，读到一行后通过future通知事件循环。
+    不使用默认线程池：Ctrl-C取消等待后，关闭事件循环时会等待线程池中仍阻塞在input()上的线程，
+    导致程序在用户按Enter之前无法退出。
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def read_line() -> None:
+        try:
+            input()
+        except EOFError:
+            pass
+        try:
+            loop.call_soon_threadsafe(_resolve, future)
+        except RuntimeError:
+            pass  # 事件循环已关闭
+    
+    threading.Thread(target=read_line, name="record-stdin", daemon=True).start()
+    await future
+
+
 async def record_workflow(
     name: str,
     description: str = "",
@@ -49,8 +82,15 @@ async def record_workflow(
             console.print("请在打开的浏览器中进行您的操作...")
             console.print("完成后按 [bold]Enter[/bold] 键停止录制")
             
-            # 等待用户输入
-            input()
+            # 在守护线程中等待用户输入，避免阻塞事件循环中的录制回调
+            try:
+                await _wait_for_enter()
+            except (asyncio.CancelledError, KeyboardInterrupt):
+                # Ctrl-C中断时仍然停止录制并保存已录制的步骤
+                console.print("\n[yellow]录制被中断，正在保存已录制的步骤...[/yellow]")
+                await recorder.stop_recording(save=True)
+                clear_workflow_cache()
+                raise
             
         else:
             # 引导式录制
@@ -59,6 +99,7 @@ async def record_workflow(
         
         # 停止录制
         workflow = await recorder.stop_recording(save=True)
+        clear_workflow_cache()
         
         if workflow and len(workflow.steps) > 0:
             console.print(f"\n[green]✅ 录制完成！[/green]")
@@ -105,6 +146,16 @@ async def _clean_workflow(workflow, output_dir: str) -> None:
             console.print(f"• {rec}")
 
 
+def _short(text: str, width: int) -> str:
+    """截断过长的文本"""
+    return f"{text[:width]}..." if len(text) > width else text
+
+
+def _format_time(value) -> str:
+    """格式化时间，空值显示为-"""
+    return value.strftime("%Y-%m-%d %H:%M") if value else "-"
+
+
 def _display_workflow_steps(workflow) -> None:
     """显示工作流步骤"""
     table = Table(title=f"工作流步骤: {workflow.name}")
@@ -113,21 +164,12 @@ def _display_workflow_steps(workflow) -> None:
     table.add_column("描述", style="green")
     table.add_column("目标", style="yellow")
     
-    for i, step in enumerate(workflow.steps, 1):
-        target = ""
-        if step.url:
-            target = step.url
-        elif step.selector:
-            target = step.selector
-        elif step.value:
-            target = step.value
-        
-        table.add_row(
-            str(i),
-            step.type.value,
-            step.description or "-",
-            target[:50] + "..." if len(target) > 50 else target
-        )
+    rows = [
+        (str(i), step.type.value, step.description or "-", _short(step.display_target, 50))
+        for i, step in enumerate(workflow.steps, 1)
+    ]
+    for row in rows:
+        table.add_row(*row)
     
     console.print(table)
 
@@ -148,22 +190,21 @@ async def list_workflows(output_dir: str = "./workflows/") -> None:
     table.add_column("步骤数", style="yellow")
     table.add_column("创建时间", style="blue")
     
-    for workflow in workflows:
-        table.add_row(
-            workflow["name"],
-            workflow["description"][:30] + "..." if len(workflow["description"]) > 30 else workflow["description"],
-            workflow["version"],
-            str(workflow["steps_count"]),
-            workflow["created_at"].strftime("%Y-%m-%d %H:%M") if workflow["created_at"] else "-"
-        )
+    # 一次性取出每个工作流所需的字段，再逐列格式化
+    fields = map(itemgetter("name", "description", "version", "steps_count", "created_at"), workflows)
+    rows = [
+        (name, _short(description, 30), version, str(steps_count), _format_time(created_at))
+        for name, description, version, steps_count, created_at in fields
+    ]
+    for row in rows:
+        table.add_row(*row)
     
     console.print(table)
 
 
 async def show_workflow(name: str, output_dir: str = "./workflows/") -> None:
     """显示工作流详情"""
-    recorder = WorkflowRecorder(output_dir=output_dir)
-    workflow = recorder.load_workflow(name)
+    workflow = load_workflow_cached(name, output_dir)
     
     if not workflow:
         console.print(f"[red]工作流 '{name}' 不存在[/red]")
@@ -193,14 +234,14 @@ def record_command(
     auto_clean: bool = typer.Option(True, "--auto-clean/--no-clean", help="自动清理")
 ):
     """录制新的工作流"""
-    asyncio.run(record_workflow(name, description, output, headless, interactive, auto_clean))
+    run_async(record_workflow(name, description, output, headless, interactive, auto_clean))
 
 
 def list_command(
     output: str = typer.Option("./workflows/", "--output", "-o", help="工作流目录")
 ):
     """列出所有工作流"""
-    asyncio.run(list_workflows(output))
+    run_async(list_workflows(output))
 
 
 def show_command(
@@ -208,4 +249,4 @@ def show_command(
     output: str = typer.Option("./workflows/", "--output", "-o", help="工作流目录")
 ):
     """显示工作流详情"""
-    asyncio.run(show_workflow(name, output))
+    run_async(show_workflow(name, output))
@@ -1,25 +1,60 @@
 """运行工作流命令"""
-import asyncio
-import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
+import orjson
 import typer
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.panel import Panel
 from rich.json import JSON
 
-from src.core.executor import PlaywrightExecutor, task_manager
-from src.core.recorder import WorkflowRecorder
 from src.models.workflow import Workflow
-from src.models.result import ExecutionStatus
+from src.utils.event_loop import run_async
 from src.utils.logger import logger
 
 console = Console()
 
+# 覆盖写入文件的标志（Windows下需要O_BINARY以避免换行符转换）
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# 表格列定义: (列名, 样式)
+_INFO_COLUMNS = (("项目", "cyan"), ("值", "green"))
+_TASK_COLUMNS = (
+    ("任务ID", "cyan"), ("工作流", "green"), ("状态", "yellow"),
+    ("开始时间", "blue"), ("批次大小", "magenta"),
+)
+_STEP_COLUMNS = (
+    ("步骤", "cyan"), ("类型", "blue"), ("状态", "yellow"),
+    ("时长(秒)", "magenta"), ("错误", "red"),
+)
+_FAILED_COLUMNS = (("执行ID", "cyan"), ("错误信息", "red"), ("失败步骤", "yellow"))
+
+# 批量结果中最多展示的失败任务数
+_MAX_FAILED_ROWS = 10
+
+
+def _new_table(columns, title: Optional[str] = None) -> Table:
+    """按列定义创建新的表格"""
+    table = Table(title=title)
+    for name, style in columns:
+        table.add_column(name, style=style)
+    return table
+
+
+def _new_progress() -> Progress:
+    """创建执行过程中使用的临时进度指示器"""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+        transient=True
+    )
+
 
 def run_workflow(
     workflow_name: str = typer.Argument(..., help="工作流名称"),
@@ -32,12 +67,14 @@ def run_workflow(
 ) -> None:
     """运行工作流"""
     
+    # 执行器和录制器依赖Playwright/Browser-Use，按需导入以缩短CLI启动时间
+    from src.core.recorder import load_workflow_cached
+    
     console.print(f"🚀 开始执行工作流: [bold cyan]{workflow_name}[/bold cyan]")
     
     try:
         # 加载工作流
-        recorder = WorkflowRecorder()
-        workflow = recorder.load_workflow(workflow_name)
+        workflow = load_workflow_cached(workflow_name)
         
         if not workflow:
             console.print(f"❌ 工作流不存在: {workflow_name}", style="red")
@@ -48,24 +85,20 @@ def run_workflow(
         
         if variables:
             try:
-                input_variables.update(json.loads(variables))
-            except json.JSONDecodeError as e:
+                input_variables.update(orjson.loads(variables))
+            except orjson.JSONDecodeError as e:
                 console.print(f"❌ 变量JSON格式错误: {e}", style="red")
                 raise typer.Exit(1)
         
         if variables_file:
             try:
-                with open(variables_file, 'r', encoding='utf-8') as f:
-                    file_vars = json.load(f)
-                    input_variables.update(file_vars)
-            except (FileNotFoundError, json.JSONDecodeError) as e:
+                input_variables.update(orjson.loads(variables_file.read_bytes()))
+            except (FileNotFoundError, orjson.JSONDecodeError) as e:
                 console.print(f"❌ 变量文件错误: {e}", style="red")
                 raise typer.Exit(1)
         
         # 显示执行信息
-        info_table = Table(title="执行信息")
-        info_table.add_column("项目", style="cyan")
-        info_table.add_column("值", style="green")
+        info_table = _new_table(_INFO_COLUMNS, title="执行信息")
         
         info_table.add_row("工作流名称", workflow_name)
         info_table.add_row("步骤数量", str(len(workflow.steps)))
@@ -77,11 +110,7 @@ def run_workflow(
         console.print(info_table)
         
         # 验证必需变量
-        missing_vars = []
-        for var_name, var_def in workflow.variables.items():
-            if var_def.required and var_name not in input_variables:
-                if var_def.default is None:
-                    missing_vars.append(var_name)
+        missing_vars = sorted(workflow.required_variable_names - input_variables.keys())
         
         if missing_vars:
             console.print(f"❌ 缺少必需变量: {', '.join(missing_vars)}", style="red")
@@ -90,7 +119,7 @@ def run_workflow(
         # 执行工作流
         console.print("\n📋 开始执行工作流...")
         
-        result = asyncio.run(_execute_workflow_async(
+        result = run_async(_execute_workflow_async(
             workflow, input_variables, headless, timeout, show_progress
         ))
         
@@ -123,15 +152,21 @@ def batch_run(
     timeout: int = typer.Option(30, "--timeout", "-t", help="超时时间(秒)"),
     output_dir: Optional[Path] = typer.Option(None, "--output-dir", "-o", help="结果输出目录"),
     continue_on_error: bool = typer.Option(True, "--continue-on-error/--stop-on-error", help="遇到错误是否继续"),
+    compact: bool = typer.Option(True, "--compact/--pretty", help="单次执行结果文件是否使用紧凑JSON格式"),
 ) -> None:
-    """批量运行工作流"""
+    """批量运行工作流
+
+    所有任务共用一个浏览器进程，每个任务在独立的浏览器上下文中执行，
+    初始Cookie和本地存储从用户数据目录导出（其他Profile数据不会加载）。
+    """
+    
+    from src.core.recorder import load_workflow_cached
     
     console.print(f"🚀 开始批量执行工作流: [bold cyan]{workflow_name}[/bold cyan]")
     
     try:
         # 加载工作流
-        recorder = WorkflowRecorder()
-        workflow = recorder.load_workflow(workflow_name)
+        workflow = load_workflow_cached(workflow_name)
         
         if not workflow:
             console.print(f"❌ 工作流不存在: {workflow_name}", style="red")
@@ -143,9 +178,8 @@ def batch_run(
             raise typer.Exit(1)
         
         try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                input_data_list = json.load(f)
-        except json.JSONDecodeError as e:
+            input_data_list = orjson.loads(data_file.read_bytes())
+        except orjson.JSONDecodeError as e:
             console.print(f"❌ 数据文件JSON格式错误: {e}", style="red")
             raise typer.Exit(1)
         
@@ -154,9 +188,7 @@ def batch_run(
             raise typer.Exit(1)
         
         # 显示批量执行信息
-        info_table = Table(title="批量执行信息")
-        info_table.add_column("项目", style="cyan")
-        info_table.add_column("值", style="green")
+        info_table = _new_table(_INFO_COLUMNS, title="批量执行信息")
         
         info_table.add_row("工作流名称", workflow_name)
         info_table.add_row("数据条数", str(len(input_data_list)))
@@ -169,7 +201,7 @@ def batch_run(
         # 执行批量任务
         console.print("\n📋 开始批量执行...")
         
-        batch_result = asyncio.run(_execute_batch_async(
+        batch_result = run_async(_execute_batch_async(
             workflow, input_data_list, concurrent, headless, timeout
         ))
         
@@ -178,7 +210,7 @@ def batch_run(
         
         # 保存结果到目录
         if output_dir:
-            _save_batch_results(batch_result, output_dir)
+            _save_batch_results(batch_result, output_dir, compact)
             console.print(f"📁 批量结果已保存到: {output_dir}")
         
         # 根据执行结果设置退出码
@@ -198,6 +230,8 @@ def batch_run(
 def list_tasks() -> None:
     """列出正在运行的任务"""
     
+    from src.core.executor import task_manager
+    
     console.print("📋 正在运行的任务:")
     
     active_tasks = task_manager.get_active_tasks()
@@ -206,12 +240,7 @@ def list_tasks() -> None:
         console.print("没有正在运行的任务", style="yellow")
         return
     
-    table = Table()
-    table.add_column("任务ID", style="cyan")
-    table.add_column("工作流", style="green")
-    table.add_column("状态", style="yellow")
-    table.add_column("开始时间", style="blue")
-    table.add_column("批次大小", style="magenta")
+    table = _new_table(_TASK_COLUMNS)
     
     for task_id, info in active_tasks.items():
         batch_size = str(info.get('batch_size', '-'))
@@ -234,6 +263,7 @@ async def _execute_workflow_async(
     show_progress: bool
 ) -> Any:
     """异步执行工作流"""
+    from src.core.executor import PlaywrightExecutor
     
     executor = PlaywrightExecutor(
         headless=headless,
@@ -242,12 +272,7 @@ async def _execute_workflow_async(
     
     try:
         if show_progress:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-                transient=True
-            ) as progress:
+            with _new_progress() as progress:
                 task = progress.add_task("执行工作流...", total=None)
                 
                 result = await executor.execute_workflow(workflow, input_variables)
@@ -270,6 +295,7 @@ async def _execute_batch_async(
     timeout: int
 ) -> Any:
     """异步批量执行工作流"""
+    from src.core.executor import PlaywrightExecutor
     
     executor = PlaywrightExecutor(
         headless=headless,
@@ -277,12 +303,7 @@ async def _execute_batch_async(
     )
     
     try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-            transient=True
-        ) as progress:
+        with _new_progress() as progress:
             task = progress.add_task(f"批量执行 {len(input_data_list)} 个任务...", total=None)
             
             result = await executor.execute_batch(
@@ -297,6 +318,17 @@ async def _execute_batch_async(
         await executor.cleanup()
 
 
+def _short(text: str, width: int) -> str:
+    """截断过长的文本"""
+    return f"{text[:width]}..." if len(text) > width else text
+
+
+def _styled_status(step_result) -> str:
+    """带颜色标记的步骤状态"""
+    style = "green" if step_result.is_successful else "red"
+    return f"[{style}]{step_result.status.value}[/{style}]"
+
+
 def _display_execution_result(result) -> None:
     """显示执行结果"""
     
@@ -310,25 +342,20 @@ def _display_execution_result(result) -> None:
     
     # 步骤结果表格
     if result.step_results:
-        table = Table(title="步骤执行结果")
-        table.add_column("步骤", style="cyan")
-        table.add_column("类型", style="blue")
-        table.add_column("状态", style="yellow")
-        table.add_column("时长(秒)", style="magenta")
-        table.add_column("错误", style="red")
-        
-        for i, step_result in enumerate(result.step_results, 1):
-            status_style = "green" if step_result.is_successful else "red"
-            duration = f"{step_result.duration:.2f}" if step_result.duration else "-"
-            error = step_result.error_message[:50] + "..." if step_result.error_message and len(step_result.error_message) > 50 else (step_result.error_message or "-")
-            
-            table.add_row(
+        table = _new_table(_STEP_COLUMNS, title="步骤执行结果")
+        
+        rows = [
+            (
                 str(i),
                 step_result.step_type,
-                f"[{status_style}]{step_result.status.value}[/{status_style}]",
-                duration,
-                error
+                _styled_status(step_result),
+                f"{step_result.duration:.2f}" if step_result.duration else "-",
+                _short(step_result.error_message or "", 50) or "-"
             )
+            for i, step_result in enumerate(result.step_results, 1)
+        ]
+        for row in rows:
+            table.add_row(*row)
         
         console.print(table)
     
@@ -352,52 +379,80 @@ def _display_batch_result(batch_result) -> None:
     console.print(f"⏱️  总时长: {batch_result.duration:.2f}秒")
     
     # 失败任务详情
-    failed_results = [r for r in batch_result.execution_results if not r.is_successful]
-    if failed_results:
-        console.print(f"\n❌ 失败任务详情 ({len(failed_results)}个):")
+    failed_count = len(batch_result.failed_results)
+    if failed_count:
+        console.print(f"\n❌ 失败任务详情 ({failed_count}个):")
         
-        table = Table()
-        table.add_column("执行ID", style="cyan")
-        table.add_column("错误信息", style="red")
-        table.add_column("失败步骤", style="yellow")
+        table = _new_table(_FAILED_COLUMNS)
         
-        for result in failed_results[:10]:  # 只显示前10个失败任务
+        # 只显示前10个失败任务
+        for result in islice(batch_result.failed_results, _MAX_FAILED_ROWS):
             table.add_row(
                 result.execution_id,
-                (result.error_message[:60] + "...") if result.error_message and len(result.error_message) > 60 else (result.error_message or "-"),
+                _short(result.error_message or "", 60) or "-",
                 result.failed_step_id or "-"
             )
         
         console.print(table)
         
-        if len(failed_results) > 10:
-            console.print(f"... 还有 {len(failed_results) - 10} 个失败任务")
+        extra = failed_count - _MAX_FAILED_ROWS
+        if extra > 0:
+            console.print(f"... 还有 {extra} 个失败任务")
+
+
+def _model_json_bytes(model, compact: bool = False) -> bytes:
+    """使用pydantic-core直接将模型序列化为JSON，不经过中间字典"""
+    return model.model_dump_json(indent=None if compact else 2).encode('utf-8')
+
+
+def _write_bytes(path: Union[str, Path], data: bytes) -> None:
+    """直接通过文件描述符写入字节，避免open()创建缓冲/编码包装对象"""
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_model_json(path: Path, model) -> None:
+    """将模型序列化为JSON并写入文件"""
+    _write_bytes(path, _model_json_bytes(model))
 
 
 def _save_result_to_file(result, output_path: Path) -> None:
     """保存执行结果到文件"""
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    result_data = result.model_dump()
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(result_data, f, ensure_ascii=False, indent=2, default=str)
+    _write_model_json(output_path, result)
 
 
-def _save_batch_results(batch_result, output_dir: Path) -> None:
-    """保存批量执行结果"""
+def _save_batch_results(batch_result, output_dir: Path, compact: bool = True) -> None:
+    """保存批量执行结果
+    
+    batch_summary.json始终缩进以便阅读；compact为True时单次执行结果使用紧凑格式。
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # 保存总结果
-    summary_file = output_dir / "batch_summary.json"
-    with open(summary_file, 'w', encoding='utf-8') as f:
-        json.dump(batch_result.model_dump(), f, ensure_ascii=False, indent=2, default=str)
+    # 保存总结果：只记录各次执行的ID，详细结果由individual_results下的文件承载，避免重复序列化
+    summary = batch_result.model_dump(mode='json', exclude={'execution_results'})
+    summary['execution_result_ids'] = [r.execution_id for r in batch_result.execution_results]
+    _write_bytes(output_dir / "batch_summary.json", orjson.dumps(summary, option=orjson.OPT_INDENT_2))
     
     # 保存各个执行结果
     results_dir = output_dir / "individual_results"
     results_dir.mkdir(exist_ok=True)
     
-    for result in batch_result.execution_results:
-        result_file = results_dir / f"{result.execution_id}.json"
-        with open(result_file, 'w', encoding='utf-8') as f:
-            json.dump(result.model_dump(), f, ensure_ascii=False, indent=2, default=str)
+    # 先在主线程完成序列化，再由线程池并发写入，使大量小文件的IO相互重叠
+    # 文件路径直接拼接字符串，避免为每个结果构造Path对象
+    prefix = str(results_dir) + os.sep
+    pending_writes = [
+        (prefix + result.execution_id + ".json", _model_json_bytes(result, compact))
+        for result in batch_result.execution_results
+    ]
+    if not pending_writes:
+        return
+    
+    with ThreadPoolExecutor(max_workers=min(32, len(pending_writes))) as pool:
+        list(pool.map(lambda item: _write_bytes(*item), pending_writes))
@@ -6,13 +6,144 @@
 import ast
 import re
 import json
-from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, ClassVar, Dict, Final, FrozenSet, Iterator, List, Optional, Tuple, TYPE_CHECKING
 from structlog import get_logger
 
 from src.models.workflow import WorkflowStep, StepType
 
+if TYPE_CHECKING:
+    from src.models.workflow import Workflow
+
 logger = get_logger(__name__)
 
+_CUSTOM: Final = StepType.CUSTOM
+# 步骤值中仅作为元数据的键
+_INTERACTED_ELEMENT: Final = 'interacted_element'
+
+# 支持识别的Browser-Use操作名称（按此顺序返回）
+_BROWSER_USE_OPS: Final[Tuple[str, ...]] = (
+    'open_tab', 'click_element_by_index', 'input_text', 'scroll_down',
+    'scroll_up', 'switch_tab', 'extract_content', 'save_pdf', 'done',
+    'wait', 'hover', 'press_key'
+)
+_OP_ORDER: Final[Dict[str, int]] = {op: i for i, op in enumerate(_BROWSER_USE_OPS)}
+# 单次扫描匹配所有操作名称；使用零宽前瞻以保留相互重叠的匹配，与逐个 `in` 判断的结果一致
+_RE_BROWSER_USE_OPS: Final = re.compile(
+    '(?=(' + '|'.join(map(re.escape, _BROWSER_USE_OPS)) + '))'
+)
+
+# 转换结果缓存的最大条目数
+_CONVERT_CACHE_SIZE: Final = 256
+# 缓存的转换结果: (来源步骤ID, 转换后的步骤, 操作名称, 转换告警(日志级别, 事件, 字段))
+_CachedConversion = Tuple[str, List[WorkflowStep], Tuple[str, ...], Tuple[Tuple[str, str, Dict[str, Any]], ...]]
+
+# 解析DOMHistoryElement格式步骤值时使用的正则，模块加载时编译一次
+_DOM_HISTORY_MARKER: Final = 'DOMHistoryElement('
+# 参数为简单字典的操作，一次扫描全部提取；按此顺序写入解析结果
+_DOM_SIMPLE_OPS: Final[Tuple[str, ...]] = (
+    'open_tab', 'input_text', 'click_element_by_index',
+    'scroll_down', 'scroll_up', 'switch_tab', 'save_pdf'
+)
+_RE_DOM_SIMPLE_OPS: Final = re.compile(
+    r"'(?P<op>" + '|'.join(_DOM_SIMPLE_OPS) + r")':\s*(?P<body>{[^}]*})"
+)
+# 这些操作要求参数非空，解析失败时直接忽略
+_NON_EMPTY_BODY_OPS: Final[FrozenSet[str]] = frozenset(('open_tab', 'input_text', 'click_element_by_index'))
+# 参数无法解析时的默认值（未列出的操作直接忽略）
+_DOM_OP_DEFAULTS: Final[Dict[str, Dict[str, Any]]] = {
+    'open_tab': {'url': 'https://www.douban.com'},
+    'scroll_down': {},
+    'scroll_up': {},
+    'switch_tab': {},
+    'save_pdf': {},
+}
+# 字典字面量开头（允许前导空白）
+_RE_DICT_START: Final = re.compile(r'\s*\{')
+_RE_EXTRACT: Final = re.compile(r"'extract_content':\s*({[^}]+?'goal':[^}]+})")
+_RE_DONE: Final = re.compile(r"'done':\s*({.+?'success':\s*True[^}]*})")
+
+# 基于常见的豆瓣网站元素索引模式推测的选择器
+_INDEX_SELECTORS: Final[Dict[int, str]] = {
+    10: 'input[name="q"], input[placeholder*="搜索"]',  # 搜索框
+    12: 'input[type="submit"], button[type="submit"], .search-button',  # 搜索按钮
+    36: '.subject-item a, .title a, .book-item a',  # 图书链接
+    39: '.subject-item a, .title a, .book-item a'   # 图书链接替代
+}
+_FALLBACK_INDEX_SELECTOR: Final = '*:nth-child(%s), [data-index="%s"]'
+
+# 提取目标关键字 -> 选择器（按顺序匹配，先匹配者优先）
+_EXTRACT_KEYWORD_SELECTORS: Final[Tuple[Tuple[re.Pattern, str], ...]] = (
+    (re.compile('rating', re.IGNORECASE),
+     '[class*="rating"], [class*="score"], .rating-num, .average-rating'),
+    (re.compile('summary|description', re.IGNORECASE),
+     '[class*="intro"], [class*="summary"], [class*="description"], .content'),
+)
+
+# Python字面量快速转JSON: 单引号字符串或字符串外的关键字（JSON专有的关键字用于拒绝快速路径）
+_RE_PY_LITERAL_TOKEN: Final = re.compile(r"'([^']*)'|\b(True|False|None|true|false|null|NaN|Infinity)\b")
+# 单引号或双引号字符串字面量（含转义字符）
+_RE_QUOTED_STRING: Final = re.compile(r"'[^'\\]*(?:\\.[^'\\]*)*'|\"[^\"\\]*(?:\\.[^\"\\]*)*\"")
+_PY_TO_JSON_KEYWORDS: Final[Dict[str, str]] = {'True': 'true', 'False': 'false', 'None': 'null'}
+
+
+def _py_token_to_json(match: re.Match) -> str:
+    """将单个Python字面量记号转换为JSON记号
+    
+    字符串外出现JSON专有的关键字（true、null、NaN等）时抛出ValueError：
+    这些文本不是合法的Python字面量，必须交给ast.literal_eval处理。
+    """
+    keyword = match.group(2)
+    if keyword is not None:
+        converted = _PY_TO_JSON_KEYWORDS.get(keyword)
+        if converted is None:
+            raise ValueError(f"非Python字面量关键字: {keyword}")
+        return converted
+    return f'"{match.group(1)}"'
+
+
+def _reject_constant(name: str) -> Any:
+    """json.loads的parse_constant回调：拒绝NaN和±Infinity"""
+    raise ValueError(f"非Python字面量常量: {name}")
+
+
+def _fast_literal(text: str) -> Any:
+    """解析Python字面量，优先走json.loads快速路径
+    
+    仅当文本不含双引号和反斜杠时才转换为JSON解析（此时单引号只可能是字符串定界符），
+    其余情况或JSON解析失败时回退到ast.literal_eval。
+    """
+    if '"' not in text and '\\' not in text:
+        try:
+            return json.loads(_RE_PY_LITERAL_TOKEN.sub(_py_token_to_json, text), parse_constant=_reject_constant)
+        except ValueError:
+            pass
+    return ast.literal_eval(text)
+
+
+
+def _looks_like_dict(text: str) -> bool:
+    """廉价的结构检查：以花括号包围，且去掉字符串字面量后花括号成对出现"""
+    if not (text.startswith('{') and text.endswith('}')):
+        return False
+    structure = _RE_QUOTED_STRING.sub('', text)
+    return structure.count('{') == structure.count('}')
+
+
+def _parse_snippet(text: str) -> Optional[Any]:
+    """解析DOMHistoryElement步骤值中截取的参数片段
+    
+    结构明显不完整（如被正则截断的嵌套字典）时直接返回None，不再依赖解析异常来判断。
+    """
+    if not _looks_like_dict(text):
+        return None
+    try:
+        return _fast_literal(text)
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return None
+
 
 class BrowserUseConverter:
     """Browser-Use操作转换器
@@ -20,36 +151,25 @@ class BrowserUseConverter:
     将Browser-Use录制的操作转换为Playwright执行器可理解的标准操作
     """
     
-    def __init__(self):
+    __slots__ = ('_convert_cache',)
+    
+    def __init__(self) -> None:
         """初始化转换器"""
-        self.operation_map = {
-            'open_tab': self._convert_open_tab,
-            'input_text': self._convert_input_text,
-            'click_element_by_index': self._convert_click_element,
-            'scroll_down': self._convert_scroll,
-            'scroll_up': self._convert_scroll,
-            'switch_tab': self._convert_switch_tab,
-            'extract_content': self._convert_extract_content,
-            'save_pdf': self._convert_save_pdf,
-            'done': self._convert_done,
-            'wait': self._convert_wait,
-            'hover': self._convert_hover,
-            'press_key': self._convert_press_key
-        }
-        
-        logger.info("Browser-Use转换器初始化完成", supported_operations=list(self.operation_map.keys()))
+        # 以步骤值为键缓存转换结果（LRU）
+        self._convert_cache: "OrderedDict[str, _CachedConversion]" = OrderedDict()
+        
+        logger.info("Browser-Use转换器初始化完成", supported_operations=list(self.operation_map))
     
     def can_convert_step(self, step: WorkflowStep) -> bool:
         """检查步骤是否可以转换"""
-        if step.type != StepType.CUSTOM:
+        if step.type != _CUSTOM:
             return False
         
         if not step.value:
             return False
         
         # 检查是否包含Browser-Use操作
-        browser_use_ops = self._extract_browser_use_operations(step.value)
-        return len(browser_use_ops) > 0
+        return _RE_BROWSER_USE_OPS.search(step.value) is not None
     
     def convert_step(self, step: WorkflowStep) -> List[WorkflowStep]:
         """转换单个步骤
@@ -60,9 +180,38 @@ class BrowserUseConverter:
         Returns:
             转换后的标准步骤列表
         """
-        if not self.can_convert_step(step):
+        converted_steps = self._try_convert(step)
+        if converted_steps is None:
             logger.warning("步骤无法转换", step_id=step.id, step_type=step.type.value)
             return [step]  # 返回原步骤
+        return converted_steps
+    
+    def _try_convert(self, step: WorkflowStep) -> Optional[List[WorkflowStep]]:
+        """检查并转换单个步骤，步骤值只检查和解析一次
+        
+        Returns:
+            转换后的步骤列表；步骤不可转换时返回None，转换失败时返回仅含原步骤的列表
+        """
+        if step.type != _CUSTOM or not step.value:
+            return None
+        
+        # 相同的步骤值只解析转换一次，之后仅替换步骤ID和来源信息
+        cached = self._convert_cache.get(step.value)
+        if cached is not None:
+            self._convert_cache.move_to_end(step.value)
+            source_id, cached_steps, op_names, notices = cached
+            # 告警针对的是步骤值本身，命中缓存时同样按新步骤ID输出
+            for level, event, fields in notices:
+                getattr(logger, level)(event, step_id=step.id, **fields)
+            logger.info("步骤转换成功",
+                       original_step_id=step.id,
+                       converted_count=len(cached_steps),
+                       operations=list(op_names))
+            return self._rebind_steps(cached_steps, source_id, step)
+        
+        # 检查是否包含Browser-Use操作
+        if _RE_BROWSER_USE_OPS.search(step.value) is None:
+            return None
         
         try:
             # 解析Browser-Use操作
@@ -73,22 +222,24 @@ class BrowserUseConverter:
             
             # 转换操作
             converted_steps = []
+            notices: List[Tuple[str, str, Dict[str, Any]]] = []
+            operation_map = self.operation_map
             for i, (op_name, op_data) in enumerate(operations.items()):
-                if op_name == 'interacted_element':
+                if op_name == _INTERACTED_ELEMENT:
                     continue  # 跳过交互元素信息，这只是元数据
                 
-                converter_func = self.operation_map.get(op_name)
+                converter_func = operation_map.get(op_name)
                 if converter_func:
                     try:
-                        new_steps = converter_func(op_data, step, i)
-                        if new_steps:
-                            converted_steps.extend(new_steps)
+                        converted_steps.append(converter_func(op_data, step, i))
                     except Exception as e:
+                        notices.append(('error', "转换操作失败", {'operation': op_name, 'error': str(e)}))
                         logger.error("转换操作失败", operation=op_name, error=str(e), step_id=step.id)
                         # 创建一个备用步骤
                         fallback_step = self._create_fallback_step(step, op_name, op_data, i)
                         converted_steps.append(fallback_step)
                 else:
+                    notices.append(('warning', "不支持的操作类型", {'operation': op_name}))
                     logger.warning("不支持的操作类型", operation=op_name, step_id=step.id)
                     # 创建一个备用步骤
                     fallback_step = self._create_fallback_step(step, op_name, op_data, i)
@@ -103,7 +254,11 @@ class BrowserUseConverter:
                        converted_count=len(converted_steps),
                        operations=list(operations.keys()))
             
-            return converted_steps
+            self._convert_cache[step.value] = (step.id, converted_steps, tuple(operations), tuple(notices))
+            if len(self._convert_cache) > _CONVERT_CACHE_SIZE:
+                self._convert_cache.popitem(last=False)
+            
+            return self._rebind_steps(converted_steps, step.id, step)
             
         except Exception as e:
             logger.error("步骤转换失败", step_id=step.id, error=str(e), exc_info=True)
@@ -118,14 +273,9 @@ class BrowserUseConverter:
         Returns:
             转换后的步骤列表
         """
-        converted_steps = []
-        
-        for step in steps:
-            if self.can_convert_step(step):
-                new_steps = self.convert_step(step)
-                converted_steps.extend(new_steps)
-            else:
-                converted_steps.append(step)
+        # 直接由生成器构建列表：列表按几何级数扩容，追加为均摊O(1)，
+        # 预分配后逐项下标赋值反而会增加每步的解释器开销
+        converted_steps = list(self._iter_converted(steps))
         
         logger.info("工作流步骤转换完成",
                    original_count=len(steps),
@@ -133,7 +283,17 @@ class BrowserUseConverter:
         
         return converted_steps
     
-    def convert_workflow(self, workflow):
+    def _iter_converted(self, steps: List[WorkflowStep]) -> Iterator[WorkflowStep]:
+        """逐个产出转换后的步骤，不可转换的步骤原样产出"""
+        try_convert = self._try_convert
+        for step in steps:
+            converted_steps = try_convert(step)
+            if converted_steps is None:
+                yield step
+            else:
+                yield from converted_steps
+    
+    def convert_workflow(self, workflow: 'Workflow') -> 'Workflow':
         """转换整个工作流
         
         Args:
@@ -174,82 +334,60 @@ class BrowserUseConverter:
     
     def _extract_browser_use_operations(self, step_value: str) -> List[str]:
         """提取Browser-Use操作类型"""
-        operations = []
-        
-        for op in ['open_tab', 'click_element_by_index', 'input_text', 'scroll_down', 
-                  'scroll_up', 'switch_tab', 'extract_content', 'save_pdf', 'done',
-                  'wait', 'hover', 'press_key']:
-            if op in step_value:
-                operations.append(op)
-        
-        return operations
+        found = {match.group(1) for match in _RE_BROWSER_USE_OPS.finditer(step_value)}
+        return sorted(found, key=_OP_ORDER.__getitem__)
     
     def _parse_browser_use_value(self, step_value: str) -> Dict[str, Any]:
         """解析Browser-Use步骤值"""
         try:
             # 处理包含DOMHistoryElement等复杂对象的情况
-            if 'DOMHistoryElement(' in step_value:
+            if _DOM_HISTORY_MARKER in step_value:
                 # 先提取不含复杂对象的基本操作
                 operations = {}
                 
-                # 提取open_tab操作
-                open_tab_match = re.search(r"'open_tab':\s*({[^}]+})", step_value)
-                if open_tab_match:
-                    try:
-                        operations['open_tab'] = ast.literal_eval(open_tab_match.group(1))
-                    except:
-                        operations['open_tab'] = {'url': 'https://www.douban.com'}
+                # 单次扫描提取参数为简单字典的操作（同名操作以首次出现为准）
+                bodies = {}
+                for match in _RE_DOM_SIMPLE_OPS.finditer(step_value):
+                    op, body = match.group('op', 'body')
+                    if op in bodies or (body == '{}' and op in _NON_EMPTY_BODY_OPS):
+                        continue
+                    bodies[op] = body
                 
-                # 提取input_text操作
-                input_text_match = re.search(r"'input_text':\s*({[^}]+})", step_value)
-                if input_text_match:
-                    try:
-                        operations['input_text'] = ast.literal_eval(input_text_match.group(1))
-                    except:
-                        pass
-                
-                # 提取click_element_by_index操作
-                click_match = re.search(r"'click_element_by_index':\s*({[^}]+})", step_value)
-                if click_match:
-                    try:
-                        operations['click_element_by_index'] = ast.literal_eval(click_match.group(1))
-                    except:
-                        pass
-                
-                # 提取其他简单操作
-                for op in ['scroll_down', 'scroll_up', 'switch_tab', 'save_pdf']:
-                    if f"'{op}'" in step_value:
-                        # 尝试提取参数
-                        op_match = re.search(rf"'{op}':\s*({{[^}}]*}})", step_value)
-                        if op_match:
-                            try:
-                                operations[op] = ast.literal_eval(op_match.group(1))
-                            except:
-                                operations[op] = {}
-                        else:
+                for op in _DOM_SIMPLE_OPS:
+                    body = bodies.get(op)
+                    if body is None:
+                        # 无参数的简单操作只要出现名称即记录为空参数
+                        if op not in _NON_EMPTY_BODY_OPS and f"'{op}'" in step_value:
                             operations[op] = {}
+                        continue
+                    parsed = _parse_snippet(body)
+                    if parsed is not None:
+                        operations[op] = parsed
+                    elif op in _DOM_OP_DEFAULTS:
+                        operations[op] = dict(_DOM_OP_DEFAULTS[op])
                 
                 # 提取extract_content操作
-                extract_match = re.search(r"'extract_content':\s*({[^}]+?'goal':[^}]+})", step_value)
+                extract_match = _RE_EXTRACT.search(step_value)
                 if extract_match:
-                    try:
-                        operations['extract_content'] = ast.literal_eval(extract_match.group(1))
-                    except:
-                        operations['extract_content'] = {'goal': 'Extract content'}
+                    parsed = _parse_snippet(extract_match.group(1))
+                    operations['extract_content'] = parsed if parsed is not None else {'goal': 'Extract content'}
                 
                 # 提取done操作
-                done_match = re.search(r"'done':\s*({.+?'success':\s*True[^}]*})", step_value)
+                done_match = _RE_DONE.search(step_value)
                 if done_match:
-                    try:
-                        operations['done'] = ast.literal_eval(done_match.group(1))
-                    except:
-                        operations['done'] = {'success': True}
+                    parsed = _parse_snippet(done_match.group(1))
+                    operations['done'] = parsed if parsed is not None else {'success': True}
                 
                 return operations
             
+            # 非字典字面量（如AgentHistory的repr）无法直接解析，跳过代价较高的字面量解析
+            if not _RE_DICT_START.match(step_value):
+                logger.debug("步骤值不是字典字面量，跳过解析", value=step_value[:100])
+                return {}
+            
             # 尝试直接解析
             try:
-                return ast.literal_eval(step_value)
+                return _fast_literal(step_value)
             except:
                 # 如果解析失败，尝试JSON解析
                 try:
@@ -264,11 +402,29 @@ class BrowserUseConverter:
             logger.error("解析Browser-Use值失败", error=str(e), value=step_value[:100])
             return {}
     
+    @staticmethod
+    def _rebind_steps(steps: List[WorkflowStep], source_id: str, step: WorkflowStep) -> List[WorkflowStep]:
+        """复制缓存的转换结果并绑定到指定的原始步骤
+        
+        缓存中的步骤ID均以来源步骤ID为前缀，替换前缀即可得到新步骤的ID。
+        返回副本（创建时间为本次转换时间），避免调用方修改影响缓存。
+        """
+        prefix_len = len(source_id)
+        now = datetime.now()
+        return [
+            cached.model_copy(update={
+                'id': step.id + cached.id[prefix_len:],
+                'created_at': now,
+                'metadata': {**cached.metadata, 'original_step_id': step.id}
+            })
+            for cached in steps
+        ]
+    
     def _create_fallback_step(self, original_step: WorkflowStep, op_name: str, op_data: Any, index: int) -> WorkflowStep:
         """创建备用步骤"""
         return WorkflowStep(
-            id=f"{original_step.id}_fallback_{index}",
             type=StepType.CUSTOM,
+            id=f"{original_step.id}_fallback_{index}",
             description=f"未转换的Browser-Use操作: {op_name}",
             value=str(op_data),
             metadata={
@@ -279,13 +435,14 @@ class BrowserUseConverter:
         )
     
     # 转换器方法
-    def _convert_open_tab(self, op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> List[WorkflowStep]:
+    @staticmethod
+    def _convert_open_tab(op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> WorkflowStep:
         """转换open_tab操作为navigate步骤"""
         url = op_data.get('url', 'https://www.douban.com')
         
-        return [WorkflowStep(
-            id=f"{original_step.id}_navigate_{index}",
+        return WorkflowStep(
             type=StepType.NAVIGATE,
+            id=f"{original_step.id}_navigate_{index}",
             description=f"导航到 {url}",
             url=url,
             timeout=30000,
@@ -294,9 +451,10 @@ class BrowserUseConverter:
                 'browser_use_operation': 'open_tab',
                 'converted_from': 'browser_use'
             }
-        )]
+        )
     
-    def _convert_input_text(self, op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> List[WorkflowStep]:
+    @staticmethod
+    def _convert_input_text(op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> WorkflowStep:
         """转换input_text操作为fill步骤"""
         text = op_data.get('text', '')
         element_index = op_data.get('index')
@@ -311,9 +469,9 @@ class BrowserUseConverter:
         if not selector:
             selector = 'input[type="text"], input[type="search"], textarea'
         
-        return [WorkflowStep(
-            id=f"{original_step.id}_fill_{index}",
+        return WorkflowStep(
             type=StepType.FILL,
+            id=f"{original_step.id}_fill_{index}",
             description=f"输入文本: {text}",
             selector=selector,
             value=text,
@@ -324,18 +482,19 @@ class BrowserUseConverter:
                 'element_index': element_index,
                 'converted_from': 'browser_use'
             }
-        )]
+        )
     
-    def _convert_click_element(self, op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> List[WorkflowStep]:
+    @staticmethod
+    def _convert_click_element(op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> WorkflowStep:
         """转换click_element_by_index操作为click步骤"""
         element_index = op_data.get('index')
         
         # 基于常见的元素索引推测选择器
-        selector = self._guess_selector_by_index(element_index)
+        selector = BrowserUseConverter._guess_selector_by_index(element_index)
         
-        return [WorkflowStep(
-            id=f"{original_step.id}_click_{index}",
+        return WorkflowStep(
             type=StepType.CLICK,
+            id=f"{original_step.id}_click_{index}",
             description=f"点击元素 (索引: {element_index})",
             selector=selector,
             timeout=10000,
@@ -346,16 +505,17 @@ class BrowserUseConverter:
                 'element_index': element_index,
                 'converted_from': 'browser_use'
             }
-        )]
+        )
     
-    def _convert_scroll(self, op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> List[WorkflowStep]:
-        """转换scroll操作为scroll步骤"""
-        direction = 'down' if 'scroll_down' in str(original_step.value) else 'up'
+    @staticmethod
+    def _convert_scroll(op_data: Dict[str, Any], original_step: WorkflowStep, index: int,
+                        direction: str = 'down') -> WorkflowStep:
+        """转换scroll操作为scroll步骤（方向由操作表绑定）"""
         amount = op_data.get('amount', 500)
         
-        return [WorkflowStep(
-            id=f"{original_step.id}_scroll_{index}",
+        return WorkflowStep(
             type=StepType.SCROLL,
+            id=f"{original_step.id}_scroll_{index}",
             description=f"向{direction}滚动 {amount}px",
             scroll_direction=direction,
             scroll_amount=amount,
@@ -364,15 +524,16 @@ class BrowserUseConverter:
                 'browser_use_operation': f'scroll_{direction}',
                 'converted_from': 'browser_use'
             }
-        )]
+        )
     
-    def _convert_switch_tab(self, op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> List[WorkflowStep]:
+    @staticmethod
+    def _convert_switch_tab(op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> WorkflowStep:
         """转换switch_tab操作为custom步骤（Playwright需要特殊处理）"""
         page_id = op_data.get('page_id', 1)
         
-        return [WorkflowStep(
-            id=f"{original_step.id}_switch_tab_{index}",
+        return WorkflowStep(
             type=StepType.CUSTOM,
+            id=f"{original_step.id}_switch_tab_{index}",
             description=f"切换到标签页 {page_id}",
             value=json.dumps({
                 'action': 'switch_tab',
@@ -384,22 +545,22 @@ class BrowserUseConverter:
                 'page_id': page_id,
                 'converted_from': 'browser_use'
             }
-        )]
+        )
     
-    def _convert_extract_content(self, op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> List[WorkflowStep]:
+    @staticmethod
+    def _convert_extract_content(op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> WorkflowStep:
         """转换extract_content操作为extract步骤"""
         goal = op_data.get('goal', 'Extract page content')
         
-        # 基于目标内容推测选择器
-        selector = 'body'  # 默认提取整个页面
-        if 'rating' in goal.lower():
-            selector = '[class*="rating"], [class*="score"], .rating-num, .average-rating'
-        elif 'summary' in goal.lower() or 'description' in goal.lower():
-            selector = '[class*="intro"], [class*="summary"], [class*="description"], .content'
+        # 基于目标内容推测选择器，默认提取整个页面
+        selector = next(
+            (candidate for pattern, candidate in _EXTRACT_KEYWORD_SELECTORS if pattern.search(goal)),
+            'body'
+        )
         
-        return [WorkflowStep(
-            id=f"{original_step.id}_extract_{index}",
+        return WorkflowStep(
             type=StepType.EXTRACT,
+            id=f"{original_step.id}_extract_{index}",
             description=f"提取内容: {goal}",
             selector=selector,
             metadata={
@@ -408,17 +569,18 @@ class BrowserUseConverter:
                 'extraction_goal': goal,
                 'converted_from': 'browser_use'
             }
-        )]
+        )
     
-    def _convert_save_pdf(self, op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> List[WorkflowStep]:
+    @staticmethod
+    def _convert_save_pdf(op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> WorkflowStep:
         """转换save_pdf操作为screenshot步骤（Playwright替代方案）"""
         filename = op_data.get('filename', f'page_export_{index}.png')
         if not filename.endswith('.png'):
             filename = filename.replace('.pdf', '.png')
         
-        return [WorkflowStep(
-            id=f"{original_step.id}_screenshot_{index}",
+        return WorkflowStep(
             type=StepType.SCREENSHOT,
+            id=f"{original_step.id}_screenshot_{index}",
             description=f"保存页面截图: {filename}",
             screenshot_path=filename,
             metadata={
@@ -428,16 +590,17 @@ class BrowserUseConverter:
                 'converted_from': 'browser_use',
                 'note': 'PDF保存转换为截图保存'
             }
-        )]
+        )
     
-    def _convert_done(self, op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> List[WorkflowStep]:
+    @staticmethod
+    def _convert_done(op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> WorkflowStep:
         """转换done操作为custom步骤（记录完成状态）"""
         success = op_data.get('success', True)
         text = op_data.get('text', 'Task completed')
         
-        return [WorkflowStep(
-            id=f"{original_step.id}_done_{index}",
+        return WorkflowStep(
             type=StepType.CUSTOM,
+            id=f"{original_step.id}_done_{index}",
             description=f"任务完成: {'成功' if success else '失败'}",
             value=json.dumps({
                 'action': 'mark_completion',
@@ -451,17 +614,18 @@ class BrowserUseConverter:
                 'completion_message': text,
                 'converted_from': 'browser_use'
             }
-        )]
+        )
     
-    def _convert_wait(self, op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> List[WorkflowStep]:
+    @staticmethod
+    def _convert_wait(op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> WorkflowStep:
         """转换wait操作为wait步骤"""
         timeout = op_data.get('timeout', 5000)
         selector = op_data.get('selector')
         condition = op_data.get('condition', 'visible')
         
-        return [WorkflowStep(
-            id=f"{original_step.id}_wait_{index}",
+        return WorkflowStep(
             type=StepType.WAIT,
+            id=f"{original_step.id}_wait_{index}",
             description=f"等待 {timeout}ms" + (f" - {selector}" if selector else ""),
             selector=selector,
             timeout=timeout,
@@ -471,15 +635,16 @@ class BrowserUseConverter:
                 'browser_use_operation': 'wait',
                 'converted_from': 'browser_use'
             }
-        )]
+        )
     
-    def _convert_hover(self, op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> List[WorkflowStep]:
+    @staticmethod
+    def _convert_hover(op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> WorkflowStep:
         """转换hover操作为hover步骤"""
         selector = op_data.get('selector', 'body')
         
-        return [WorkflowStep(
-            id=f"{original_step.id}_hover_{index}",
+        return WorkflowStep(
             type=StepType.HOVER,
+            id=f"{original_step.id}_hover_{index}",
             description=f"悬停在元素上",
             selector=selector,
             timeout=10000,
@@ -488,15 +653,16 @@ class BrowserUseConverter:
                 'browser_use_operation': 'hover',
                 'converted_from': 'browser_use'
             }
-        )]
+        )
     
-    def _convert_press_key(self, op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> List[WorkflowStep]:
+    @staticmethod
+    def _convert_press_key(op_data: Dict[str, Any], original_step: WorkflowStep, index: int) -> WorkflowStep:
         """转换press_key操作为press_key步骤"""
         key = op_data.get('key', 'Enter')
         
-        return [WorkflowStep(
-            id=f"{original_step.id}_press_{index}",
+        return WorkflowStep(
             type=StepType.PRESS_KEY,
+            id=f"{original_step.id}_press_{index}",
             description=f"按键: {key}",
             key=key,
             metadata={
@@ -504,23 +670,32 @@ class BrowserUseConverter:
                 'browser_use_operation': 'press_key',
                 'converted_from': 'browser_use'
             }
-        )]
+        )
     
-    def _guess_selector_by_index(self, element_index: Optional[int]) -> str:
+    @staticmethod
+    def _guess_selector_by_index(element_index: Optional[int]) -> str:
         """基于元素索引推测选择器"""
         if element_index is None:
             return 'button, a, input[type="submit"], [role="button"]'
         
-        # 基于常见的豆瓣网站元素索引模式
-        selector_map = {
-            10: 'input[name="q"], input[placeholder*="搜索"]',  # 搜索框
-            12: 'input[type="submit"], button[type="submit"], .search-button',  # 搜索按钮
-            36: '.subject-item a, .title a, .book-item a',  # 图书链接
-            39: '.subject-item a, .title a, .book-item a'   # 图书链接替代
-        }
-        
-        return selector_map.get(element_index, f'*:nth-child({element_index}), [data-index="{element_index}"]')
+        return _INDEX_SELECTORS.get(element_index) or _FALLBACK_INDEX_SELECTOR % (element_index, element_index)
+    
+    # 操作名称 -> 转换函数（类级别只构建一次；滚动方向在此绑定，无需再扫描原始步骤值）
+    operation_map: ClassVar[Dict[str, Callable[..., WorkflowStep]]] = {
+        'open_tab': _convert_open_tab,
+        'input_text': _convert_input_text,
+        'click_element_by_index': _convert_click_element,
+        'scroll_down': partial(_convert_scroll, direction='down'),
+        'scroll_up': partial(_convert_scroll, direction='up'),
+        'switch_tab': _convert_switch_tab,
+        'extract_content': _convert_extract_content,
+        'save_pdf': _convert_save_pdf,
+        'done': _convert_done,
+        'wait': _convert_wait,
+        'hover': _convert_hover,
+        'press_key': _convert_press_key
+    }
 
 
 # 全局转换器实例
-browser_use_converter = BrowserUseConverter() 
\ No newline at end of file
+browser_use_converter = BrowserUseConverter()
@@ -1,30 +1,133 @@
 """Browser-Use工作流执行器模块"""
 import asyncio
+import functools
+import hashlib
 import json
+import re
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from browser_use import Agent
+import orjson
 from structlog import get_logger
 
 from src.core.config import config
 from src.models.result import (
     ExecutionStatus, StepResult, WorkflowExecutionResult, BatchExecutionResult, execution_history
 )
-from src.models.workflow import Workflow, WorkflowStep, StepType
+from src.models.workflow import Workflow, WorkflowStep, StepType, parse_step_value
 from src.utils.renderer import renderer, context_manager
 
 logger = get_logger(__name__)
 
 
+# 执行结果缓存的最大条目数
+_RESULT_CACHE_SIZE = 128
+
+# 单次执行中Agent的最大步数
+_AGENT_MAX_STEPS = 15
+
+# 从done步骤识别出的豆瓣图书任务描述
+_DOUBAN_BOOK_TASK = "在豆瓣网站上搜索图书《代码简洁之道》或《代码整洁之道》，获取图书的评分、简介、作者、出版社等基本信息，并保存为PDF文件。"
+
+
+@functools.lru_cache(maxsize=256)
+def _infer_task_description(done_values: Tuple[str, ...]) -> str:
+    """从done步骤值推断任务描述
+    
+    相同的步骤值组合（如批量执行同一工作流）只解析一次。
+    
+    Args:
+        done_values: 包含done操作的custom步骤值，按从后往前的顺序
+        
+    Returns:
+        推断出的任务描述，无法推断时返回空字符串
+    """
+    for value in done_values:
+        step_data = parse_step_value(value)
+        if not isinstance(step_data, dict):
+            continue
+        try:
+            if "done" in step_data and "text" in step_data["done"]:
+                # 从done步骤的文本中提取任务的主要目标
+                done_text = step_data["done"]["text"]
+                if "代码简洁之道" in done_text or "代码整洁之道" in done_text:
+                    return _DOUBAN_BOOK_TASK
+                return ""
+        except TypeError:
+            continue
+    return ""
+
+
+# Browser-Use Agent类，首次使用时导入（避免仅使用Playwright执行器时加载整个Browser-Use依赖栈）
+_agent_cls: Optional[type] = None
+
+
+def _get_agent_cls() -> type:
+    """获取Browser-Use Agent类，首次调用时导入并缓存"""
+    global _agent_cls
+    
+    if _agent_cls is None:
+        from browser_use import Agent
+        _agent_cls = Agent
+    return _agent_cls
+
+
+# 执行历史后台写入：执行结果入队后立即返回，由单个写入任务批量落盘
+_HISTORY_BATCH_SIZE = 32
+_history_queue: Optional["asyncio.Queue[WorkflowExecutionResult]"] = None
+_history_writer: Optional[asyncio.Task] = None
+
+
+async def _write_history(queue: "asyncio.Queue[WorkflowExecutionResult]") -> None:
+    """持续从队列取出执行结果，每批结果在一次线程调用中写入执行历史"""
+    while True:
+        items = [await queue.get()]
+        while len(items) < _HISTORY_BATCH_SIZE and not queue.empty():
+            items.append(queue.get_nowait())
+        try:
+            await asyncio.to_thread(execution_history.save_execution_results, items)
+            logger.info("执行历史已保存", count=len(items))
+        except Exception as e:
+            logger.warning("保存执行历史失败", error=str(e))
+        finally:
+            for _ in items:
+                queue.task_done()
+
+
+def _enqueue_history(result: WorkflowExecutionResult) -> None:
+    """将执行结果加入后台写入队列（写入任务绑定在当前事件循环上，按需创建）"""
+    global _history_queue, _history_writer
+    
+    loop = asyncio.get_running_loop()
+    if _history_writer is None or _history_writer.done() or _history_writer.get_loop() is not loop:
+        _history_queue = asyncio.Queue()
+        _history_writer = loop.create_task(_write_history(_history_queue))
+    _history_queue.put_nowait(result)
+
+
+async def flush_execution_history() -> None:
+    """等待已入队的执行历史全部写入"""
+    if (_history_writer is not None and not _history_writer.done()
+            and _history_writer.get_loop() is asyncio.get_running_loop()):
+        await _history_queue.join()
+
+
 class BrowserUseExecutor:
     """Browser-Use工作流执行器
     
     使用Browser-Use执行从Browser-Use录制的工作流步骤
     """
     
+    __slots__ = ('headless', 'timeout', 'agent', 'is_running', 'current_execution')
+    
+    # LLM客户端缓存: (api_base, api_key, api_version, deployment_name, model) -> 客户端
+    _llm_cache: Dict[Tuple[Any, ...], Any] = {}
+    # 可缓存工作流的执行结果（LRU）: 指纹 -> 执行结果
+    _result_cache: "OrderedDict[str, WorkflowExecutionResult]" = OrderedDict()
+    
     def __init__(self, 
                  headless: bool = None,
                  timeout: int = None):
@@ -44,9 +147,9 @@ class BrowserUseExecutor:
         self.is_running = False
         self.current_execution = None
         
-        logger.info("Browser-Use执行器初始化完成",
-                   headless=self.headless,
-                   timeout=self.timeout)
+        logger.debug("Browser-Use执行器初始化完成",
+                    headless=self.headless,
+                    timeout=self.timeout)
     
     async def execute_workflow(self, 
                              workflow: Workflow,
@@ -65,6 +168,33 @@ class BrowserUseExecutor:
         execution_id = execution_id or f"exec_{uuid.uuid4().hex[:8]}"
         input_variables = input_variables or {}
         
+        # 可缓存的工作流在相同输入下直接复用最近一次成功的执行结果
+        cache_key = self._result_cache_key(workflow, input_variables) if workflow.cacheable else None
+        if cache_key is not None:
+            cached_result = self._result_cache.get(cache_key)
+            if cached_result is not None:
+                self._result_cache.move_to_end(cache_key)
+                logger.info("复用缓存的执行结果",
+                           workflow_name=workflow.name,
+                           execution_id=execution_id,
+                           cached_execution_id=cached_result.execution_id)
+                # 复用结果按一次新的执行记录：使用本次的执行ID和时间，并同样保存执行历史；
+                # 元数据标记为缓存结果，历史和统计据此区分未实际运行浏览器的执行
+                now = datetime.now()
+                result = cached_result.model_copy(deep=True, update={
+                    'execution_id': execution_id,
+                    'start_time': now,
+                    'end_time': now,
+                    'duration': 0.0,
+                    'metadata': {
+                        **cached_result.metadata,
+                        'cached': True,
+                        'cached_execution_id': cached_result.execution_id
+                    }
+                })
+                _enqueue_history(result)
+                return result
+        
         # 创建执行结果对象
         result = WorkflowExecutionResult(
             workflow_name=workflow.name,
@@ -103,19 +233,23 @@ class BrowserUseExecutor:
             
             # 执行任务
             # run方法只需要max_steps参数，任务描述已经在Agent构造时传递
-            history = await self.agent.run(max_steps=15)
+            history = await self.agent.run(max_steps=_AGENT_MAX_STEPS)
             
-            # 创建步骤结果
-            for i, step in enumerate(workflow.steps):
-                step_result = StepResult(
+            # 创建步骤结果（Agent整体执行任务，各步骤共用同一完成时间）
+            now = datetime.now()
+            max_retries = config.execution.retry_count
+            result.add_step_results([
+                StepResult(
                     step_id=step.id,
                     step_type=step.type.value,
                     status=ExecutionStatus.COMPLETED,
-                    start_time=datetime.now(),
-                    max_retries=config.execution.retry_count
+                    start_time=now,
+                    end_time=now,
+                    duration=0.0,
+                    max_retries=max_retries
                 )
-                step_result.mark_success()
-                result.add_step_result(step_result)
+                for step in workflow.steps
+            ])
             
             # 设置输出变量
             result.output_variables = context_manager.get_context()
@@ -123,21 +257,28 @@ class BrowserUseExecutor:
             # 标记完成
             result.mark_completed()
             
+            if cache_key is not None and result.is_successful:
+                self._cache_result(cache_key, result)
+            
             logger.info("工作流执行完成（Browser-Use）",
                        workflow_name=workflow.name,
                        execution_id=execution_id,
                        status=result.status.value,
                        success_rate=result.success_rate)
             
-            # 保存执行历史
-            try:
-                execution_history.save_execution_result(result)
-                logger.info("执行历史已保存", execution_id=execution_id)
-            except Exception as e:
-                logger.warning("保存执行历史失败", error=str(e))
-            
             return result
             
+        except asyncio.CancelledError:
+            logger.warning("工作流执行被取消（Browser-Use）",
+                          workflow_name=workflow.name,
+                          execution_id=execution_id)
+            
+            # 先记录结束时间，再覆盖按步骤推断出的状态
+            result.error_message = "执行被取消"
+            result.mark_completed()
+            result.status = ExecutionStatus.CANCELLED
+            raise
+            
         except Exception as e:
             logger.error("工作流执行失败（Browser-Use）",
                         workflow_name=workflow.name,
@@ -149,20 +290,29 @@ class BrowserUseExecutor:
             result.error_message = str(e)
             result.mark_completed()
             
-            # 保存执行历史（即使失败也要保存）
-            try:
-                execution_history.save_execution_result(result)
-                logger.info("执行历史已保存（失败）", execution_id=execution_id)
-            except Exception as save_error:
-                logger.warning("保存执行历史失败", error=str(save_error))
-            
             return result
             
         finally:
+            # 成功、失败和取消都只在此保存一次执行历史（由后台写入任务完成）
+            if result.is_completed:
+                _enqueue_history(result)
+            
             self.is_running = False
             self.current_execution = None
             await self._cleanup_agent()
     
+    @classmethod
+    async def warmup(cls) -> None:
+        """预热：提前导入LLM依赖并创建客户端，降低首次执行的延迟
+        
+        LLM客户端缓存在类上，预热后创建的所有执行器实例共享。
+        """
+        azure_config = config.recording.browser_use.azure_openai
+        if azure_config.is_configured:
+            # 模块导入和客户端创建是同步的，放到线程中避免阻塞事件循环
+            await asyncio.to_thread(cls._get_llm, azure_config)
+            logger.info("Browser-Use执行器预热完成", model=azure_config.model)
+    
     async def _initialize_agent(self, task_description: str) -> None:
         """初始化Browser-Use Agent"""
         try:
@@ -171,23 +321,14 @@ class BrowserUseExecutor:
             if not azure_config.is_configured:
                 raise ValueError("Azure OpenAI配置不完整，请检查API密钥和基础URL")
             
-            # 创建LLM配置
-            from langchain_openai import AzureChatOpenAI
-            
-            llm = AzureChatOpenAI(
-                azure_endpoint=azure_config.api_base,
-                api_key=azure_config.api_key,
-                api_version=azure_config.api_version,
-                azure_deployment=azure_config.deployment_name,
-                model=azure_config.model,
-                temperature=0.1
-            )
+            # 获取LLM客户端（相同配置复用已创建的客户端及其连接池）
+            llm = self._get_llm(azure_config)
             
             # 创建Browser-Use Agent
             # 注意：Browser-Use Agent不直接支持headless参数
             # 浏览器配置通过browser_profile或browser_session控制
             # 任务描述在构造函数中传递
-            self.agent = Agent(
+            self.agent = _get_agent_cls()(
                 task=task_description,
                 llm=llm
             )
@@ -201,6 +342,60 @@ class BrowserUseExecutor:
             logger.error("Browser-Use Agent初始化失败", error=str(e))
             raise
     
+    def _result_cache_key(self, workflow: Workflow, input_variables: Dict[str, Any]) -> str:
+        """计算执行结果缓存键
+        
+        指纹覆盖所有影响执行结果的内容：交给Agent的任务描述、工作流步骤、输入变量、
+        模型以及执行器设置。
+        """
+        payload = orjson.dumps(
+            {
+                'name': workflow.name,
+                'task': self._build_task_description(workflow),
+                'steps': [(s.id, s.type.value, s.value, s.description) for s in workflow.steps],
+                'inputs': input_variables,
+                'model': config.recording.browser_use.azure_openai.model,
+                'headless': self.headless,
+                'max_steps': _AGENT_MAX_STEPS,
+            },
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    @classmethod
+    def _cache_result(cls, cache_key: str, result: WorkflowExecutionResult) -> None:
+        """缓存成功的执行结果，超出容量时淘汰最久未使用的条目"""
+        cls._result_cache[cache_key] = result.model_copy(deep=True)
+        cls._result_cache.move_to_end(cache_key)
+        while len(cls._result_cache) > _RESULT_CACHE_SIZE:
+            cls._result_cache.popitem(last=False)
+    
+    @classmethod
+    def _get_llm(cls, azure_config) -> Any:
+        """获取Azure OpenAI LLM客户端，按配置缓存以便跨执行复用"""
+        key = (
+            azure_config.api_base,
+            azure_config.api_key,
+            azure_config.api_version,
+            azure_config.deployment_name,
+            azure_config.model,
+        )
+        llm = cls._llm_cache.get(key)
+        if llm is None:
+            from langchain_openai import AzureChatOpenAI
+            
+            llm = AzureChatOpenAI(
+                azure_endpoint=azure_config.api_base,
+                api_key=azure_config.api_key,
+                api_version=azure_config.api_version,
+                azure_deployment=azure_config.deployment_name,
+                model=azure_config.model,
+                temperature=0.1
+            )
+            cls._llm_cache[key] = llm
+        return llm
+    
     async def _cleanup_agent(self) -> None:
         """清理Browser-Use Agent"""
         if self.agent:
@@ -209,7 +404,7 @@ class BrowserUseExecutor:
                 # 注意：具体的清理方法可能需要根据Browser-Use的API调整
                 await self.agent.close() if hasattr(self.agent, 'close') else None
                 self.agent = None
-                logger.info("Browser-Use Agent已清理")
+                logger.debug("Browser-Use Agent已清理")
             except Exception as e:
                 logger.warning("清理Browser-Use Agent失败", error=str(e))
     
@@ -219,34 +414,26 @@ class BrowserUseExecutor:
         # 从工作流描述开始
         task_description = workflow.description
         
-        # 如果没有描述，尝试从步骤中提取任务信息
+        # 如果没有描述，尝试从步骤中提取任务信息（从后往前的done步骤）
         if not task_description or task_description.strip() == "":
-            # 尝试从最后一个done步骤中提取任务描述
-            for step in reversed(workflow.steps):
-                if step.type == StepType.CUSTOM and "done" in step.value:
-                    try:
-                        import ast
-                        step_data = ast.literal_eval(step.value)
-                        if "done" in step_data and "text" in step_data["done"]:
-                            # 从done步骤的文本中提取任务描述
-                            done_text = step_data["done"]["text"]
-                            # 提取任务的主要目标
-                            if "代码简洁之道" in done_text or "代码整洁之道" in done_text:
-                                task_description = "在豆瓣网站上搜索图书《代码简洁之道》或《代码整洁之道》，获取图书的评分、简介、作者、出版社等基本信息，并保存为PDF文件。"
-                            break
-                    except:
-                        continue
+            done_values = tuple(
+                step.value for step in reversed(workflow.steps)
+                if step.type == StepType.CUSTOM and step.value and "done" in step.value
+            )
+            if done_values:
+                task_description = _infer_task_description(done_values)
         
         # 如果仍然没有描述，使用默认描述
         if not task_description or task_description.strip() == "":
             task_description = "执行浏览器自动化任务"
         
-        logger.info("构建的任务描述", task_description=task_description)
+        logger.debug("构建的任务描述", task_description=task_description)
         return task_description
     
     async def cleanup(self) -> None:
         """清理执行器"""
         await self._cleanup_agent()
+        await flush_execution_history()
 
 
 class HybridExecutor:
@@ -257,6 +444,15 @@ class HybridExecutor:
     - 标准步骤使用PlaywrightExecutor
     """
     
+    __slots__ = ('headless', 'timeout', 'playwright_executor', 'browser_use_executor')
+    
+    # Browser-Use特有的操作名称，编译为单个正则以便一次扫描步骤值
+    _BROWSER_USE_MARKERS = re.compile('|'.join(map(re.escape, (
+        'open_tab', 'click_element_by_index', 'input_text',
+        'scroll_down', 'switch_tab', 'extract_content',
+        'save_pdf', 'done'
+    ))))
+    
     def __init__(self, 
                  headless: bool = None,
                  timeout: int = None):
@@ -268,9 +464,16 @@ class HybridExecutor:
         from src.core.executor import PlaywrightExecutor
         
         self.playwright_executor = PlaywrightExecutor(headless, None, timeout)
-        self.browser_use_executor = BrowserUseExecutor(headless, timeout)
+        # Browser-Use执行器在首次遇到Browser-Use工作流时才创建
+        self.browser_use_executor: Optional[BrowserUseExecutor] = None
         
-        logger.info("混合执行器初始化完成")
+        logger.debug("混合执行器初始化完成")
+    
+    def _get_browser_use_executor(self) -> BrowserUseExecutor:
+        """获取Browser-Use执行器，首次调用时创建"""
+        if self.browser_use_executor is None:
+            self.browser_use_executor = BrowserUseExecutor(self.headless, self.timeout)
+        return self.browser_use_executor
     
     async def execute_workflow(self, 
                              workflow: Workflow,
@@ -281,7 +484,7 @@ class HybridExecutor:
         # 检查工作流类型
         if self._is_browser_use_workflow(workflow):
             logger.info("检测到Browser-Use工作流，使用Browser-Use执行器")
-            return await self.browser_use_executor.execute_workflow(
+            return await self._get_browser_use_executor().execute_workflow(
                 workflow, input_variables, execution_id
             )
         else:
@@ -291,28 +494,34 @@ class HybridExecutor:
             )
     
     def _is_browser_use_workflow(self, workflow: Workflow) -> bool:
-        """检测是否为Browser-Use工作流"""
+        """检测是否为Browser-Use工作流
         
-        # 检查是否所有步骤都是custom类型
-        custom_steps = sum(1 for step in workflow.steps if step.type == StepType.CUSTOM)
-        total_steps = len(workflow.steps)
+        至少80%的步骤是custom类型，且custom步骤中包含Browser-Use特有的操作。
+        单次遍历同时统计步骤类型和检查操作，结论确定后立即返回。
+        """
+        steps = workflow.steps
+        total_steps = len(steps)
         
-        # 如果超过80%的步骤是custom类型，认为是Browser-Use工作流
-        if total_steps > 0 and custom_steps / total_steps >= 0.8:
-            # 进一步检查custom步骤的内容
-            for step in workflow.steps:
-                if step.type == StepType.CUSTOM:
-                    # 检查是否包含Browser-Use特有的操作
-                    if any(op in step.value for op in [
-                        'open_tab', 'click_element_by_index', 'input_text', 
-                        'scroll_down', 'switch_tab', 'extract_content', 
-                        'save_pdf', 'done'
-                    ]):
-                        return True
+        # custom步骤占比 >= 80% 等价于 非custom步骤数 * 5 <= 总步骤数
+        non_custom_steps = 0
+        marker_found = False
+        for i, step in enumerate(steps):
+            if step.type != StepType.CUSTOM:
+                non_custom_steps += 1
+                if non_custom_steps * 5 > total_steps:
+                    return False
+            elif not marker_found and self._BROWSER_USE_MARKERS.search(step.value):
+                marker_found = True
+            
+            # 已找到操作，且剩余步骤全部为非custom也不会低于80%
+            if marker_found and (non_custom_steps + total_steps - i - 1) * 5 <= total_steps:
+                return True
         
-        return False
+        return marker_found
     
     async def cleanup(self) -> None:
-        """清理执行器"""
+        """清理执行器，并等待已入队的执行历史写入"""
         await self.playwright_executor.cleanup()
-        await self.browser_use_executor.cleanup() 
\ No newline at end of file
+        if self.browser_use_executor is not None:
+            await self.browser_use_executor.cleanup()
+        await flush_execution_history() 
\ No newline at end of file
@@ -4,23 +4,109 @@ Browser-Use自愈引擎
 """
 
 import asyncio
-import json
-import uuid
+import os
+import re
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Set, Tuple
 
+import aiofiles
+import orjson
 from browser_use import Agent, Browser
 from browser_use.browser.browser import BrowserConfig
 
 from ..models.error import (
-    ErrorContext, HealingSession, HealingAction, HealingStatus
+    ErrorContext, ErrorType, HealingSession, HealingAction, HealingStatus
 )
 from ..core.config import config
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 选择器候选表（按优先级排列）
+_CLICK_SEARCH = (
+    'input[type="submit"]',
+    'button[type="submit"]',
+    '.search-button',
+    '.btn-search',
+    '[value*="搜索"]',
+    '[value*="search"]',
+    'button:contains("搜索")',
+    'input[value="搜索"]',
+)
+_CLICK_BUTTON = (
+    'button',
+    'input[type="button"]',
+    'input[type="submit"]',
+    '.btn',
+    '.button',
+    '[role="button"]',
+)
+_CLICK_LINK = (
+    'a[href]',
+    '.link',
+    '[role="link"]',
+)
+_FILL_SEARCH_KEYWORDS = ("搜索", "search", "查找")
+_FILL_SEARCH = (
+    'input[name="q"]',
+    'input[name="query"]',
+    'input[name="search"]',
+    'input[placeholder*="搜索"]',
+    'input[placeholder*="search"]',
+    'input[type="search"]',
+    '#search-input',
+    '#query',
+    '.search-input',
+)
+_FILL_GENERIC = (
+    'input[type="text"]',
+    'input:not([type])',
+    'textarea',
+    '[contenteditable="true"]',
+)
+_ATTR_RE = re.compile(r'\[.*?\]')
+
+
+# 自愈提示模板
+_HEALING_PROMPT_TEMPLATE = (
+    "我需要修复一个自动化脚本中失败的操作。\n"
+    "\n"
+    "错误信息：{error_message}\n"
+    "错误类型：{error_type}\n"
+    "失败的步骤：{step_action}\n"
+    "\n"
+    "当前页面URL：{page_url}\n"
+    "页面标题：{page_title}\n"
+    "\n"
+    "请分析当前页面状态，找到合适的方法完成这个操作。如果原始选择器不工作，请寻找功能相似的替代元素。\n"
+    "请一步步执行操作，并确保操作成功完成。"
+)
+
+
+# UUID4变体位：随机十六进制字符 -> 8/9/a/b
+_UUID_VARIANT_CHARS = {c: '89ab'[int(c, 16) & 3] for c in '0123456789abcdef'}
+
+
+def _new_id() -> str:
+    """生成标准UUID4格式的随机ID（不构造uuid.UUID对象）"""
+    h = os.urandom(16).hex()
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{_UUID_VARIANT_CHARS[h[16]]}{h[17:20]}-{h[20:]}"
+
+@lru_cache(maxsize=None)
+def _merge_groups(groups: Tuple[Tuple[str, ...], ...]) -> Tuple[str, ...]:
+    """合并静态候选组并去重（组合数量有限，结果直接缓存）"""
+    return tuple(dict.fromkeys(chain.from_iterable(groups)))
+
+
+def _unique_selectors(groups: Tuple[Tuple[str, ...], ...], extra: Tuple[str, ...] = ()) -> List[str]:
+    """按顺序合并候选组和动态选择器，移除重复项和空选择器"""
+    unique = dict.fromkeys(chain(_merge_groups(groups), extra))
+    unique.pop('', None)
+    return list(unique)
+
 
 class BrowserUseHealer:
     """Browser-Use自愈引擎"""
@@ -43,13 +129,18 @@ class BrowserUseHealer:
         
         # 活跃会话
         self.active_sessions: Dict[str, HealingSession] = {}
+        # 活跃会话状态（独立存放，状态轮询无需访问会话对象）
+        self._session_status: Dict[str, HealingStatus] = {}
+        
+        # 已创建的保存目录
+        self._prepared_dirs: Set[str] = set()
         
         logger.info(f"Browser-Use自愈引擎初始化完成，配置: {self.config}")
     
     async def start_healing_session(self, error_context: ErrorContext) -> HealingSession:
         """启动自愈会话"""
         try:
-            session_id = str(uuid.uuid4())
+            session_id = _new_id()
             logger.info(f"启动自愈会话: {session_id}")
             
             # 生成自愈目标
@@ -65,6 +156,7 @@ class BrowserUseHealer:
             
             # 记录活跃会话
             self.active_sessions[session_id] = session
+            self._session_status[session_id] = session.status
             
             logger.info(f"自愈会话创建成功: {session_id}, 目标: {healing_goal}")
             return session
@@ -83,27 +175,30 @@ class BrowserUseHealer:
             healing_success = await self._simulate_browser_use_healing(session)
             
             if healing_success:
-                session.status = HealingStatus.SUCCESS
-                session.success = True
-                session.end_time = datetime.now()
+                self._finish_session(session)
                 logger.info(f"Browser-Use自愈成功: {session.session_id}")
                 return True
             else:
-                session.status = HealingStatus.FAILED
-                session.success = False
-                session.failure_reason = "Browser-Use自愈失败"
-                session.end_time = datetime.now()
+                self._finish_session(session, "Browser-Use自愈失败")
                 logger.warning(f"Browser-Use自愈失败: {session.session_id}")
                 return False
                 
         except Exception as e:
             logger.error(f"Browser-Use自愈失败: {e}")
-            session.status = HealingStatus.FAILED
-            session.success = False
-            session.failure_reason = str(e)
-            session.end_time = datetime.now()
+            self._finish_session(session, str(e))
             return False
     
+    def _finish_session(self, session: HealingSession, failure_reason: Optional[str] = None):
+        """结束自愈会话，未提供失败原因时视为成功"""
+        success = failure_reason is None
+        session.status = HealingStatus.SUCCESS if success else HealingStatus.FAILED
+        if session.session_id in self._session_status:
+            self._session_status[session.session_id] = session.status
+        session.success = success
+        if not success:
+            session.failure_reason = failure_reason
+        session.end_time = datetime.now()
+    
     async def _simulate_browser_use_healing(self, session: HealingSession) -> bool:
         """模拟Browser-Use自愈（用于演示和测试）"""
         try:
@@ -113,99 +208,25 @@ class BrowserUseHealer:
             
             logger.info(f"模拟Browser-Use自愈: 错误类型={error_type}, 步骤类型={step_data.get('type')}")
             
-            # 根据错误类型生成自愈步骤
+            # 根据错误类型生成自愈步骤，同时记录对应的自愈操作
+            build_steps = self._HEALING_STEP_BUILDERS.get(error_type)
             new_steps = []
+            healing_actions = []
+            prefix = session.session_id[:8]
+            for i, step in enumerate(build_steps(self, session, step_data) if build_steps else ()):
+                new_steps.append(step)
+                healing_actions.append(HealingAction(
+                    action_id=f"action_{prefix}_{i}",
+                    action_type=step["type"],
+                    selector=step.get("selector"),
+                    value=step.get("value"),
+                    description=step["description"],
+                    success=True  # 假设会成功
+                ))
             
-            if "timeout" in str(error_type).lower():
-                # 超时错误：添加等待步骤和重试
-                if step_data.get("type") == "click":
-                    new_steps = [
-                        {
-                            "id": f"healed_wait_{session.session_id[:8]}",
-                            "type": "wait",
-                            "description": "等待页面稳定（自愈添加）",
-                            "selector": step_data.get("selector", ""),
-                            "timeout": 5000,
-                            "wait_condition": "visible"
-                        },
-                        {
-                            "id": f"healed_click_{session.session_id[:8]}",
-                            "type": "click",
-                            "description": f"重新点击（自愈修复）: {step_data.get('description', '')}",
-                            "selector": step_data.get("selector", ""),
-                            "timeout": 15000,
-                            "wait_condition": "visible"
-                        }
-                    ]
-                elif step_data.get("type") == "fill":
-                    new_steps = [
-                        {
-                            "id": f"healed_wait_{session.session_id[:8]}",
-                            "type": "wait",
-                            "description": "等待输入框可用（自愈添加）",
-                            "selector": step_data.get("selector", ""),
-                            "timeout": 5000,
-                            "wait_condition": "visible"
-                        },
-                        {
-                            "id": f"healed_fill_{session.session_id[:8]}",
-                            "type": "fill",
-                            "description": f"重新填写（自愈修复）: {step_data.get('description', '')}",
-                            "selector": step_data.get("selector", ""),
-                            "value": step_data.get("value", ""),
-                            "timeout": 15000
-                        }
-                    ]
-            
-            elif "element_not_found" in str(error_type).lower():
-                # 元素未找到：生成更强的选择器策略
-                original_selector = step_data.get("selector", "")
-                step_type = step_data.get("type", "")
-                
-                if step_type == "click":
-                    # 生成多个备选点击策略
-                    enhanced_selectors = self._generate_enhanced_selectors_for_click(original_selector, step_data)
-                    
-                    for i, selector in enumerate(enhanced_selectors[:3]):  # 最多3个备选
-                        new_steps.append({
-                            "id": f"healed_click_{session.session_id[:8]}_{i}",
-                            "type": "click",
-                            "description": f"备选点击策略{i+1}（自愈修复）: {step_data.get('description', '')}",
-                            "selector": selector,
-                            "timeout": 15000,
-                            "wait_condition": "visible"
-                        })
-                
-                elif step_type == "fill":
-                    # 生成通用的填写策略
-                    value = step_data.get("value", "")
-                    enhanced_selectors = self._generate_enhanced_selectors_for_fill(original_selector, value)
-                    
-                    for i, selector in enumerate(enhanced_selectors[:2]):  # 最多2个备选
-                        new_steps.append({
-                            "id": f"healed_fill_{session.session_id[:8]}_{i}",
-                            "type": "fill",
-                            "description": f"备选填写策略{i+1}（自愈修复）: {step_data.get('description', '')}",
-                            "selector": selector,
-                            "value": value,
-                            "timeout": 15000
-                        })
-            
-            # 如果生成了新步骤，记录自愈操作
             if new_steps:
                 session.new_steps = new_steps
-                
-                # 创建自愈操作记录
-                for i, step in enumerate(new_steps):
-                    healing_action = HealingAction(
-                        action_id=f"action_{session.session_id[:8]}_{i}",
-                        action_type=step["type"],
-                        selector=step.get("selector"),
-                        value=step.get("value"),
-                        description=step["description"],
-                        success=True  # 假设会成功
-                    )
-                    session.healing_actions.append(healing_action)
+                session.healing_actions.extend(healing_actions)
                 
                 logger.info(f"生成了{len(new_steps)}个自愈步骤")
                 return True
@@ -217,106 +238,129 @@ class BrowserUseHealer:
             logger.error(f"模拟Browser-Use自愈失败: {e}")
             return False
     
+    def _build_timeout_steps(self, session: HealingSession, step_data: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """超时错误：添加等待步骤和重试"""
+        prefix = session.session_id[:8]
+        if step_data.get("type") == "click":
+            return [
+                {
+                    "id": f"healed_wait_{prefix}",
+                    "type": "wait",
+                    "description": "等待页面稳定（自愈添加）",
+                    "selector": step_data.get("selector", ""),
+                    "timeout": 5000,
+                    "wait_condition": "visible"
+                },
+                {
+                    "id": f"healed_click_{prefix}",
+                    "type": "click",
+                    "description": f"重新点击（自愈修复）: {step_data.get('description', '')}",
+                    "selector": step_data.get("selector", ""),
+                    "timeout": 15000,
+                    "wait_condition": "visible"
+                }
+            ]
+        elif step_data.get("type") == "fill":
+            return [
+                {
+                    "id": f"healed_wait_{prefix}",
+                    "type": "wait",
+                    "description": "等待输入框可用（自愈添加）",
+                    "selector": step_data.get("selector", ""),
+                    "timeout": 5000,
+                    "wait_condition": "visible"
+                },
+                {
+                    "id": f"healed_fill_{prefix}",
+                    "type": "fill",
+                    "description": f"重新填写（自愈修复）: {step_data.get('description', '')}",
+                    "selector": step_data.get("selector", ""),
+                    "value": step_data.get("value", ""),
+                    "timeout": 15000
+                }
+            ]
+        return []
+    
+    def _build_element_not_found_steps(self, session: HealingSession, step_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """元素未找到：生成更强的选择器策略"""
+        prefix = session.session_id[:8]
+        original_selector = step_data.get("selector", "")
+        step_type = step_data.get("type", "")
+        
+        if step_type == "click":
+            # 生成多个备选点击策略
+            enhanced_selectors = self._generate_enhanced_selectors_for_click(original_selector, step_data)
+            
+            for i, selector in enumerate(enhanced_selectors[:3]):  # 最多3个备选
+                yield {
+                    "id": f"healed_click_{prefix}_{i}",
+                    "type": "click",
+                    "description": f"备选点击策略{i+1}（自愈修复）: {step_data.get('description', '')}",
+                    "selector": selector,
+                    "timeout": 15000,
+                    "wait_condition": "visible"
+                }
+        
+        elif step_type == "fill":
+            # 生成通用的填写策略
+            value = step_data.get("value", "")
+            enhanced_selectors = self._generate_enhanced_selectors_for_fill(original_selector, value)
+            
+            for i, selector in enumerate(enhanced_selectors[:2]):  # 最多2个备选
+                yield {
+                    "id": f"healed_fill_{prefix}_{i}",
+                    "type": "fill",
+                    "description": f"备选填写策略{i+1}（自愈修复）: {step_data.get('description', '')}",
+                    "selector": selector,
+                    "value": value,
+                    "timeout": 15000
+                }
+    
+    # 错误类型 -> 自愈步骤生成方法
+    _HEALING_STEP_BUILDERS = {
+        ErrorType.TIMEOUT: _build_timeout_steps,
+        ErrorType.ELEMENT_NOT_FOUND: _build_element_not_found_steps,
+    }
+    
     def _generate_enhanced_selectors_for_click(self, original_selector: str, step_data: Dict[str, Any]) -> List[str]:
         """为点击操作生成增强的选择器"""
-        enhanced_selectors = []
-        
         # 基于描述推测可能的选择器
         description = step_data.get("description", "").lower()
         
+        groups = ()
         if "搜索" in description or "search" in description:
-            enhanced_selectors.extend([
-                'input[type="submit"]',
-                'button[type="submit"]',
-                '.search-button',
-                '.btn-search',
-                '[value*="搜索"]',
-                '[value*="search"]',
-                'button:contains("搜索")',
-                'input[value="搜索"]'
-            ])
-        
+            groups += (_CLICK_SEARCH,)
         if "按钮" in description or "button" in description:
-            enhanced_selectors.extend([
-                'button',
-                'input[type="button"]',
-                'input[type="submit"]',
-                '.btn',
-                '.button',
-                '[role="button"]'
-            ])
-        
+            groups += (_CLICK_BUTTON,)
         if "链接" in description or "link" in description:
-            enhanced_selectors.extend([
-                'a[href]',
-                '.link',
-                '[role="link"]'
-            ])
+            groups += (_CLICK_LINK,)
         
         # 添加通用的备选选择器
+        extra = ()
         if original_selector:
             # 简化选择器
             simplified = original_selector.split(',')[0].strip()
-            enhanced_selectors.append(simplified)
-            
             # 移除特定的属性
-            import re
-            base_selector = re.sub(r'\[.*?\]', '', simplified)
-            if base_selector and base_selector != simplified:
-                enhanced_selectors.append(base_selector)
-        
-        # 移除重复项并保持顺序
-        seen = set()
-        unique_selectors = []
-        for selector in enhanced_selectors:
-            if selector and selector not in seen:
-                seen.add(selector)
-                unique_selectors.append(selector)
+            base_selector = _ATTR_RE.sub('', simplified)
+            extra = (simplified, base_selector)
         
-        return unique_selectors
+        return _unique_selectors(groups, extra)
     
     def _generate_enhanced_selectors_for_fill(self, original_selector: str, value: str) -> List[str]:
         """为填写操作生成增强的选择器"""
-        enhanced_selectors = []
-        
         # 基于要填写的内容推测可能的选择器
         value_lower = value.lower()
         
-        if any(keyword in value_lower for keyword in ["搜索", "search", "查找"]):
-            enhanced_selectors.extend([
-                'input[name="q"]',
-                'input[name="query"]',
-                'input[name="search"]',
-                'input[placeholder*="搜索"]',
-                'input[placeholder*="search"]',
-                'input[type="search"]',
-                '#search-input',
-                '#query',
-                '.search-input'
-            ])
-        
-        # 通用输入框选择器
-        enhanced_selectors.extend([
-            'input[type="text"]',
-            'input:not([type])',
-            'textarea',
-            '[contenteditable="true"]'
-        ])
+        if any(keyword in value_lower for keyword in _FILL_SEARCH_KEYWORDS):
+            groups = (_FILL_SEARCH, _FILL_GENERIC)
+        else:
+            # 通用输入框选择器
+            groups = (_FILL_GENERIC,)
         
         # 基于原始选择器的变体
-        if original_selector:
-            simplified = original_selector.split(',')[0].strip()
-            enhanced_selectors.append(simplified)
-        
-        # 移除重复项
-        seen = set()
-        unique_selectors = []
-        for selector in enhanced_selectors:
-            if selector and selector not in seen:
-                seen.add(selector)
-                unique_selectors.append(selector)
+        extra = (original_selector.split(',')[0].strip(),) if original_selector else ()
         
-        return unique_selectors
+        return _unique_selectors(groups, extra)
     
     async def _restore_context(self, agent: Agent, error_context: ErrorContext):
         """恢复页面上下文"""
@@ -352,16 +396,17 @@ class BrowserUseHealer:
             
             # 解析Agent的操作历史
             if hasattr(agent, 'history') and agent.history:
-                for i, action in enumerate(agent.history):
-                    healing_action = HealingAction(
-                        action_id=str(uuid.uuid4()),
+                healing_actions.extend(
+                    HealingAction(
+                        action_id=_new_id(),
                         action_type=action.get('action_type', 'unknown'),
                         selector=action.get('selector'),
                         value=action.get('value'),
                         description=action.get('description', f'自愈操作 {i+1}'),
                         success=True  # 假设Agent成功执行了操作
                     )
-                    healing_actions.append(healing_action)
+                    for i, action in enumerate(agent.history)
+                )
             
             logger.info(f"自愈任务执行完成，记录了 {len(healing_actions)} 个操作")
             
@@ -369,7 +414,7 @@ class BrowserUseHealer:
             logger.error(f"执行自愈任务失败: {e}")
             # 记录失败操作
             healing_action = HealingAction(
-                action_id=str(uuid.uuid4()),
+                action_id=_new_id(),
                 action_type="error",
                 description=f"自愈任务失败: {str(e)}",
                 success=False
@@ -378,23 +423,33 @@ class BrowserUseHealer:
         
         return healing_actions
     
+    # (错误类型, 步骤类型) -> 自愈目标生成函数
+    _GOAL_BUILDERS = {
+        (ErrorType.ELEMENT_NOT_FOUND, "click"): lambda step_data: (
+            f"找到并点击 {step_data.get('element_description', step_data.get('selector', '目标元素'))}，"
+            f"如果找不到原始元素，请寻找功能相似的替代元素"
+        ),
+        (ErrorType.ELEMENT_NOT_FOUND, "type"): lambda step_data: (
+            f"找到 {step_data.get('element_description', step_data.get('selector', '输入框'))} "
+            f"并输入 '{step_data.get('value', '')}'，如果找不到原始元素，请寻找功能相似的替代元素"
+        ),
+        (ErrorType.TIMEOUT, None): lambda step_data: (
+            f"等待页面加载完成，然后执行原始操作：{step_data.get('type', 'unknown')}"
+        ),
+    }
+    
     def _generate_healing_goal(self, error_context: ErrorContext) -> str:
         """生成自愈目标"""
         step_data = error_context.step_data
         error_type = error_context.error_type
         
-        # 根据错误类型和步骤数据生成目标
-        if error_type == "element_not_found":
-            if step_data.get("type") == "click":
-                target = step_data.get("element_description", step_data.get("selector", "目标元素"))
-                return f"找到并点击 {target}，如果找不到原始元素，请寻找功能相似的替代元素"
-            elif step_data.get("type") == "type":
-                target = step_data.get("element_description", step_data.get("selector", "输入框"))
-                value = step_data.get("value", "")
-                return f"找到 {target} 并输入 '{value}'，如果找不到原始元素，请寻找功能相似的替代元素"
-        
-        elif error_type == "timeout":
-            return f"等待页面加载完成，然后执行原始操作：{step_data.get('type', 'unknown')}"
+        # 根据错误类型和步骤类型生成目标，(错误类型, None) 匹配任意步骤类型
+        build_goal = (
+            self._GOAL_BUILDERS.get((error_type, step_data.get("type")))
+            or self._GOAL_BUILDERS.get((error_type, None))
+        )
+        if build_goal:
+            return build_goal(step_data)
         
         # 通用目标
         action_desc = self._describe_step_action(step_data)
@@ -422,21 +477,13 @@ class BrowserUseHealer:
     
     def _build_healing_prompt(self, error_context: ErrorContext) -> str:
         """构建自愈提示"""
-        prompt_parts = [
-            f"我需要修复一个自动化脚本中失败的操作。",
-            f"",
-            f"错误信息：{error_context.error_message}",
-            f"错误类型：{error_context.error_type}",
-            f"失败的步骤：{self._describe_step_action(error_context.step_data)}",
-            f"",
-            f"当前页面URL：{error_context.page_url or '未知'}",
-            f"页面标题：{error_context.page_title or '未知'}",
-            f"",
-            f"请分析当前页面状态，找到合适的方法完成这个操作。如果原始选择器不工作，请寻找功能相似的替代元素。",
-            f"请一步步执行操作，并确保操作成功完成。"
-        ]
-        
-        return "\n".join(prompt_parts)
+        return _HEALING_PROMPT_TEMPLATE.format_map({
+            "error_message": error_context.error_message,
+            "error_type": error_context.error_type,
+            "step_action": self._describe_step_action(error_context.step_data),
+            "page_url": error_context.page_url or '未知',
+            "page_title": error_context.page_title or '未知',
+        })
     
     async def _generate_new_steps(
         self, 
@@ -484,41 +531,44 @@ class BrowserUseHealer:
         
         # 从活跃会话中移除
         del self.active_sessions[session_id]
+        self._session_status.pop(session_id, None)
         
         logger.info(f"自愈会话完成: {session_id}, 成功: {session.success}")
         return session
     
     async def cancel_healing_session(self, session_id: str) -> bool:
         """取消自愈会话"""
-        session = self.active_sessions.get(session_id)
+        session = self.active_sessions.pop(session_id, None)
         if not session:
             return False
         
-        session.status = HealingStatus.FAILED
-        session.success = False
-        session.failure_reason = "用户取消"
-        session.end_time = datetime.now()
-        
-        del self.active_sessions[session_id]
+        self._session_status.pop(session_id, None)
+        self._finish_session(session, "用户取消")
         
         logger.info(f"自愈会话已取消: {session_id}")
         return True
     
     async def get_healing_status(self, session_id: str) -> Optional[HealingStatus]:
         """获取自愈状态"""
-        session = self.active_sessions.get(session_id)
-        return session.status if session else None
+        return self._session_status.get(session_id)
     
     async def save_healing_session(self, session: HealingSession, save_dir: str = "logs/healing") -> str:
         """保存自愈会话"""
         try:
             save_path = Path(save_dir)
-            save_path.mkdir(parents=True, exist_ok=True)
+            if save_dir not in self._prepared_dirs:
+                await asyncio.to_thread(save_path.mkdir, parents=True, exist_ok=True)
+                self._prepared_dirs.add(save_dir)
             
             file_path = save_path / f"healing_{session.session_id}.json"
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(session.dict(), f, indent=2, ensure_ascii=False, default=str)
+            # 序列化放到线程中执行，避免阻塞事件循环
+            payload = await asyncio.to_thread(
+                orjson.dumps, session.dict(), default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+            async with aiofiles.open(file_path, 'wb') as f:
+                await f.write(payload)
             
             logger.info(f"自愈会话已保存: {file_path}")
             return str(file_path)
@@ -532,14 +582,15 @@ class BrowserUseHealer:
         try:
             file_path = Path(save_dir) / f"healing_{session_id}.json"
             
-            if not file_path.exists():
+            try:
+                async with aiofiles.open(file_path, 'rb') as f:
+                    content = await f.read()
+            except FileNotFoundError:
                 return None
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
+            data = await asyncio.to_thread(orjson.loads, content)
             return HealingSession(**data)
             
         except Exception as e:
             logger.error(f"加载自愈会话失败: {e}")
-            return None 
\ No newline at end of file
+            return None
@@ -6,12 +6,11 @@ from typing import Any, Dict, Optional
 import yaml
 from pydantic import BaseModel, Field
 
-# 尝试加载python-dotenv
+# 优先使用libyaml实现的加载器
 try:
-    from dotenv import load_dotenv
-    load_dotenv()  # 自动加载.env文件
+    from yaml import CSafeLoader as _YamlLoader
 except ImportError:
-    pass  # 如果没有安装python-dotenv，继续使用环境变量
+    from yaml import SafeLoader as _YamlLoader
 
 
 class AppConfig(BaseModel):
@@ -35,6 +34,16 @@ class AzureOpenAIConfig(BaseModel):
         return bool(self.api_key and self.api_base)
 
 
+# Azure OpenAI配置字段与环境变量的对应关系
+_AZURE_ENV = (
+    ("api_key", "AZURE_OPENAI_API_KEY"),
+    ("api_base", "AZURE_OPENAI_API_BASE"),
+    ("api_version", "AZURE_OPENAI_API_VERSION"),
+    ("deployment_name", "AZURE_OPENAI_DEPLOYMENT_NAME"),
+    ("model", "AZURE_OPENAI_MODEL"),
+)
+
+
 class BrowserUseConfig(BaseModel):
     """Browser-Use配置"""
     headless: bool = False
@@ -102,8 +111,8 @@ class Config(BaseModel):
             # 如果配置文件不存在，返回默认配置
             return cls()
         
-        with open(config_file, "r", encoding="utf-8") as f:
-            config_data = yaml.safe_load(f)
+        with open(config_file, "rb") as f:
+            config_data = yaml.load(f, Loader=_YamlLoader)
         
         return cls(**config_data)
 
@@ -112,24 +121,41 @@ class Config(BaseModel):
         """从环境变量加载配置"""
         config = cls()
         
-        # 从环境变量加载Azure OpenAI配置
-        azure_config = config.recording.browser_use.azure_openai
-        azure_config.api_key = os.getenv("AZURE_OPENAI_API_KEY")
-        azure_config.api_base = os.getenv("AZURE_OPENAI_API_BASE") 
-        azure_config.api_version = os.getenv("AZURE_OPENAI_API_VERSION", azure_config.api_version)
-        azure_config.deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", azure_config.deployment_name)
-        azure_config.model = os.getenv("AZURE_OPENAI_MODEL", azure_config.model)
+        # 从环境变量加载Azure OpenAI配置（未设置的变量保留默认值）
+        azure_values = {
+            attr: value
+            for attr, env_name in _AZURE_ENV
+            if (value := os.environ.get(env_name)) is not None
+        }
+        azure_config = AzureOpenAIConfig(**azure_values)
+        config.recording.browser_use.azure_openai = azure_config
         
         # 同时为healing配置设置Azure OpenAI
-        healing_azure_config = config.healing.browser_use.azure_openai
-        healing_azure_config.api_key = azure_config.api_key
-        healing_azure_config.api_base = azure_config.api_base
-        healing_azure_config.api_version = azure_config.api_version
-        healing_azure_config.deployment_name = azure_config.deployment_name
-        healing_azure_config.model = azure_config.model
+        config.healing.browser_use.azure_openai = azure_config.model_copy()
         
         return config
 
 
-# 全局配置实例
-config = Config.load_from_env()
+def _load_dotenv() -> None:
+    """尝试加载.env文件"""
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()  # 自动加载.env文件
+    except ImportError:
+        pass  # 如果没有安装python-dotenv，继续使用环境变量
+
+
+# .env在导入时加载：部分代码（如scripts/setup_azure_openai.py）直接读取os.environ，不经过config
+_load_dotenv()
+
+
+def __getattr__(name: str) -> Any:
+    """延迟创建全局配置实例（PEP 562）
+
+    首次访问 `config`（包括 `from src.core.config import config`）时从环境变量创建，
+    并写回模块命名空间，之后的访问不再经过此函数。
+    """
+    if name == "config":
+        config = globals()["config"] = Config.load_from_env()
+        return config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
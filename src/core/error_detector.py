@@ -4,11 +4,15 @@
 """
 
 import os
+import re
+import gzip
 import json
 import uuid
 import asyncio
 from pathlib import Path
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
 from playwright.async_api import Page, Error as PlaywrightError
 
@@ -21,9 +25,46 @@ from ..utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _compile_keywords(keywords: List[str]) -> re.Pattern:
+    """将关键字列表编译为一个交替正则（按字面量匹配）"""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+def _dump_json(file_path: Path, data: Dict[str, Any]) -> None:
+    """将数据写入JSON文件（必要时创建目录）"""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+
+
+def _write_gzip_text(file_path: Path, text: str) -> None:
+    """以gzip压缩写入文本（压缩级别1，CPU开销小）"""
+    with gzip.open(file_path, 'wt', encoding='utf-8', compresslevel=1) as f:
+        f.write(text)
+
+
+# 可尝试自愈的错误消息关键字（消息已转为小写）
+_TIMEOUT_KEYWORDS_RE = _compile_keywords([
+    "timeout", "超时", "timed out", "execution timeout",
+    "步骤执行超时", "wait timeout"
+])
+_ELEMENT_KEYWORDS_RE = _compile_keywords([
+    "element not found", "selector", "not visible",
+    "not clickable", "元素未找到"
+])
+
+
 class ErrorDetector:
     """错误检测和分析器"""
     
+    # 可自愈的错误类型
+    _HEALABLE_TYPES = frozenset({
+        ErrorType.ELEMENT_NOT_FOUND,
+        ErrorType.TIMEOUT,
+        ErrorType.JAVASCRIPT_ERROR,
+        ErrorType.SELECTOR_INVALID
+    })
+    
     def __init__(self, screenshot_dir: str = "logs/screenshots", dom_dir: str = "logs/dom"):
         self.screenshot_dir = Path(screenshot_dir)
         self.dom_dir = Path(dom_dir)
@@ -75,6 +116,19 @@ class ErrorDetector:
             ]
         }
         
+        # 预编译分类规则：每种错误类型一个交替正则（保持规则顺序即优先级），
+        # 另有一个合并正则用于快速排除不匹配任何规则的消息
+        self._pattern_regexes = tuple(
+            (error_type, _compile_keywords(patterns))
+            for error_type, patterns in self.error_patterns.items()
+        )
+        self._any_pattern_regex = _compile_keywords(
+            [pattern for patterns in self.error_patterns.values() for pattern in patterns]
+        )
+        
+        # 重试时同一错误会被反复分类，按 (异常类型名, 错误消息) 缓存结果
+        self._classify_cached = lru_cache(maxsize=1024)(self._classify)
+        
         # 严重程度映射
         self.severity_mapping = {
             ErrorType.ELEMENT_NOT_FOUND: ErrorSeverity.MEDIUM,
@@ -121,19 +175,25 @@ class ErrorDetector:
             if page:
                 try:
                     page_url = page.url
-                    page_title = await page.title()
-                    browser_type = page.context.browser.browser_type.name
                     viewport_size = page.viewport_size
-                    user_agent = await page.evaluate("navigator.userAgent")
-                    
-                    # 截图
-                    screenshot_path = await self._capture_screenshot(page, error_id)
-                    
-                    # DOM快照
-                    dom_snapshot = await self._capture_dom_snapshot(page, error_id)
-                    
+                    browser_type = page.context.browser.browser_type.name
                 except Exception as e:
                     logger.warning(f"捕获页面状态时出错: {e}")
+                
+                # 页面标题、UA、截图和DOM快照互不依赖，并发捕获
+                results = await asyncio.gather(
+                    page.title(),
+                    page.evaluate("navigator.userAgent"),
+                    self._capture_screenshot(page, error_id),
+                    self._capture_dom_snapshot(page, error_id),
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, BaseException):
+                        logger.warning(f"捕获页面状态时出错: {result}")
+                page_title, user_agent, screenshot_path, dom_snapshot = (
+                    None if isinstance(result, BaseException) else result for result in results
+                )
             
             # 创建错误上下文
             error_context = ErrorContext(
@@ -177,17 +237,21 @@ class ErrorDetector:
     
     def classify_error(self, error: Exception) -> ErrorType:
         """分类错误类型"""
-        error_message = str(error).lower()
-        error_type_name = type(error).__name__.lower()
+        return self._classify_cached(type(error).__name__, str(error))
+    
+    def _classify(self, type_name: str, message: str) -> ErrorType:
+        """按异常类型名和错误消息分类（结果由 _classify_cached 缓存）"""
+        error_message = message.lower()
+        error_type_name = type_name.lower()
         
         # 优先检查异常类型
         if "timeout" in error_type_name:
             return ErrorType.TIMEOUT
         
         # 然后检查错误消息
-        for error_type, patterns in self.error_patterns.items():
-            for pattern in patterns:
-                if pattern in error_message:
+        if self._any_pattern_regex.search(error_message):
+            for error_type, regex in self._pattern_regexes:
+                if regex.search(error_message):
                     return error_type
         
         # 特殊处理一些常见的异常类型
@@ -197,7 +261,7 @@ class ErrorDetector:
             return ErrorType.TIMEOUT
         elif "element" in error_message and "not found" in error_message:
             return ErrorType.ELEMENT_NOT_FOUND
-        elif "步骤执行超时" in str(error):
+        elif "步骤执行超时" in message:
             return ErrorType.TIMEOUT
         elif "execution timeout" in error_message:
             return ErrorType.TIMEOUT
@@ -210,37 +274,23 @@ class ErrorDetector:
         if error_context.severity == ErrorSeverity.CRITICAL:
             return False
         
-        # 某些特定错误类型可自愈
-        healable_types = [
-            ErrorType.ELEMENT_NOT_FOUND,
-            ErrorType.TIMEOUT,
-            ErrorType.JAVASCRIPT_ERROR,
-            ErrorType.SELECTOR_INVALID
-        ]
-        
         # 检查错误类型是否在可自愈列表中
-        if error_context.error_type in healable_types:
+        if error_context.error_type in self._HEALABLE_TYPES:
             return True
         
         # 基于错误消息的额外判断
         error_message = error_context.error_message.lower()
         
         # 超时相关错误都可以尝试自愈
-        if any(keyword in error_message for keyword in [
-            "timeout", "超时", "timed out", "execution timeout",
-            "步骤执行超时", "wait timeout"
-        ]):
+        if _TIMEOUT_KEYWORDS_RE.search(error_message):
             return True
         
         # 元素相关错误可以尝试自愈
-        if any(keyword in error_message for keyword in [
-            "element not found", "selector", "not visible",
-            "not clickable", "元素未找到"
-        ]):
+        if _ELEMENT_KEYWORDS_RE.search(error_message):
             return True
         
         # 默认情况下，严重程度为LOW或MEDIUM的错误可以尝试自愈
-        if error_context.severity in [ErrorSeverity.LOW, ErrorSeverity.MEDIUM]:
+        if error_context.severity in (ErrorSeverity.LOW, ErrorSeverity.MEDIUM):
             return True
         
         return False
@@ -290,14 +340,13 @@ class ErrorDetector:
     async def _capture_dom_snapshot(self, page: Page, error_id: str) -> Optional[str]:
         """捕获DOM快照"""
         try:
-            dom_path = self.dom_dir / f"error_{error_id}.html"
+            dom_path = self.dom_dir / f"error_{error_id}.html.gz"
             
             # 获取页面HTML
             html_content = await page.content()
             
-            # 保存到文件
-            with open(dom_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            # 压缩保存到文件（放到线程中执行，避免大页面写盘阻塞事件循环）
+            await asyncio.to_thread(_write_gzip_text, dom_path, html_content)
             
             return str(dom_path)
         except Exception as e:
@@ -309,18 +358,19 @@ class ErrorDetector:
         if not error_contexts:
             return {}
         
-        # 统计错误类型
-        error_type_counts = {}
-        severity_counts = {}
+        # 单次遍历统计错误类型、严重程度和自愈情况
+        error_type_counts = Counter()
+        severity_counts = Counter()
+        healable_count = 0
+        success_count = 0
         
         for context in error_contexts:
-            error_type_counts[context.error_type] = error_type_counts.get(context.error_type, 0) + 1
-            severity_counts[context.severity] = severity_counts.get(context.severity, 0) + 1
+            error_type_counts[context.error_type] += 1
+            severity_counts[context.severity] += 1
+            healable_count += context.is_healable
+            success_count += context.healing_status == HealingStatus.SUCCESS
         
         # 计算自愈成功率
-        healable_count = sum(1 for ctx in error_contexts if ctx.is_healable)
-        success_count = sum(1 for ctx in error_contexts if ctx.healing_status == HealingStatus.SUCCESS)
-        
         healing_success_rate = success_count / healable_count if healable_count > 0 else 0
         
         return {
@@ -329,19 +379,16 @@ class ErrorDetector:
             "severity_distribution": severity_counts,
             "healable_count": healable_count,
             "healing_success_rate": healing_success_rate,
-            "most_common_error": max(error_type_counts, key=error_type_counts.get) if error_type_counts else None
+            "most_common_error": error_type_counts.most_common(1)[0][0] if error_type_counts else None
         }
     
     async def save_error_context(self, error_context: ErrorContext, save_dir: str = "logs/errors") -> str:
         """保存错误上下文到文件"""
         try:
             save_path = Path(save_dir)
-            save_path.mkdir(parents=True, exist_ok=True)
-            
             file_path = save_path / f"error_{error_context.error_id}.json"
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(error_context.dict(), f, indent=2, ensure_ascii=False, default=str)
+            await asyncio.to_thread(_dump_json, file_path, error_context.dict())
             
             logger.info(f"错误上下文已保存: {file_path}")
             return str(file_path)
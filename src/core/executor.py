@@ -22,6 +22,26 @@ from src.models.error import HealingStatus
 
 logger = get_logger(__name__)
 
+# 浏览器启动参数
+_LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-web-security',
+    '--disable-features=VizDisplayCompositor',
+    '--disable-blink-features=AutomationControlled',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-extensions-except',
+    '--disable-plugins-discovery'
+]
+
+# 浏览器上下文参数（持久化上下文和批量执行的独立上下文共用）
+_CONTEXT_OPTIONS = {
+    'viewport': {'width': 1280, 'height': 720},
+    'locale': 'zh-CN',
+    'timezone_id': 'Asia/Shanghai'
+}
+
 
 class PlaywrightExecutor:
     """Playwright工作流执行器
@@ -52,6 +72,8 @@ class PlaywrightExecutor:
         self.browser = None
         self.context = None
         self.page = None
+        # 是否由本执行器负责关闭浏览器（批量执行时子执行器借用父执行器的浏览器）
+        self._owns_browser = True
         
         # 执行状态
         self.is_running = False
@@ -216,14 +238,15 @@ class PlaywrightExecutor:
                    concurrent_limit=concurrent_limit)
         
         try:
-            # 创建信号量控制并发数
+            # 所有任务共享同一个浏览器进程，信号量控制并发数
+            storage_state = await self._start_batch_browser()
             semaphore = asyncio.Semaphore(concurrent_limit)
             
             # 创建执行任务
             tasks = []
             for i, input_data in enumerate(input_data_list):
                 task = self._execute_single_task(
-                    workflow, input_data, semaphore, f"{batch_id}_{i}"
+                    workflow, input_data, semaphore, f"{batch_id}_{i}", storage_state
                 )
                 tasks.append(task)
             
@@ -268,27 +291,101 @@ class PlaywrightExecutor:
             batch_result.mark_completed()
             
             return batch_result
+            
+        finally:
+            await self._cleanup_browser()
+    
+    async def _start_batch_browser(self) -> Optional[Dict[str, Any]]:
+        """启动批量执行共享的浏览器
+        
+        持久化上下文只能打开一个，所有任务都在其中运行会共享Cookie、本地存储和登录状态，
+        因此批量执行启动普通浏览器，由每个任务创建自己的上下文。
+        用户数据目录中的Cookie和本地存储先导出一次，每个任务的上下文从这份状态开始，
+        登录状态与单次执行一致，任务之间的修改互不影响。
+        
+        Returns:
+            从用户数据目录导出的存储状态，导出失败时为None
+        """
+        storage_state = await self._export_profile_state()
+        
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+        chrome_path = self._get_chrome_path()
+        try:
+            self.browser = await self.playwright.chromium.launch(
+                headless=self.headless,
+                executable_path=chrome_path,
+                args=_LAUNCH_ARGS
+            )
+        except Exception as e:
+            logger.warning("使用Chrome失败，回退到Chromium", error=str(e))
+            self.browser = await self.playwright.chromium.launch(
+                headless=self.headless,
+                args=_LAUNCH_ARGS
+            )
+        
+        logger.info("批量执行浏览器启动完成", headless=self.headless, chrome_path=chrome_path)
+        return storage_state
+    
+    async def _export_profile_state(self) -> Optional[Dict[str, Any]]:
+        """从持久化用户数据目录导出Cookie和本地存储，导出后关闭持久化上下文"""
+        try:
+            await self._initialize_browser()
+            storage_state = await self.browser.storage_state()
+            logger.info("已导出用户数据状态", user_data_dir=self.user_data_dir,
+                       cookies=len(storage_state.get('cookies', [])))
+            return storage_state
+        except Exception as e:
+            logger.warning("导出用户数据状态失败，批量任务将不带登录状态执行",
+                          user_data_dir=self.user_data_dir, error=str(e))
+            return None
+        finally:
+            persistent_context = self.browser
+            self.browser = None
+            self.page = None
+            if persistent_context is not None:
+                try:
+                    await persistent_context.close()
+                except Exception as e:
+                    logger.warning("关闭持久化上下文失败", error=str(e))
     
     async def _execute_single_task(self,
                                  workflow: Workflow,
                                  input_data: Dict[str, Any],
                                  semaphore: asyncio.Semaphore,
-                                 execution_id: str) -> WorkflowExecutionResult:
-        """执行单个任务（用于批量执行）"""
+                                 execution_id: str,
+                                 storage_state: Optional[Dict[str, Any]] = None) -> WorkflowExecutionResult:
+        """执行单个任务（用于批量执行）
+        
+        任务在独立的浏览器上下文中执行（从用户数据目录导出的状态开始），结束后关闭上下文，
+        页面上注册的路由和对话框处理器随之释放，不会影响后续任务。
+        """
         async with semaphore:
-            # 为每个任务创建独立的执行器实例
-            executor = PlaywrightExecutor(
-                headless=self.headless,
-                user_data_dir=self.user_data_dir,
-                timeout=self.timeout // 1000  # 转换回秒
-            )
-            
+            context = await self.browser.new_context(storage_state=storage_state, **_CONTEXT_OPTIONS)
             try:
+                page = await context.new_page()
+                await self._prepare_page(page)
+                
+                # 子执行器借用共享浏览器和本任务的上下文，避免每个任务重新启动浏览器
+                executor = PlaywrightExecutor(
+                    headless=self.headless,
+                    user_data_dir=self.user_data_dir,
+                    timeout=self.timeout // 1000  # 转换回秒
+                )
+                executor.playwright = self.playwright
+                executor.browser = context
+                executor.context = context
+                executor.page = page
+                executor._owns_browser = False
+                
                 return await executor.execute_workflow(
                     workflow, input_data, execution_id
                 )
             finally:
-                await executor.cleanup()
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning("关闭浏览器上下文失败", execution_id=execution_id, error=str(e))
     
     async def _execute_step(self, step: WorkflowStep, step_number: int) -> StepResult:
         """执行单个步骤（集成自愈功能）
@@ -822,19 +919,6 @@ class PlaywrightExecutor:
             # 检测本地Chrome路径
             chrome_path = self._get_chrome_path()
             
-            # 配置启动参数
-            launch_args = [
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-web-security',
-                '--disable-features=VizDisplayCompositor',
-                '--disable-blink-features=AutomationControlled',
-                '--no-first-run',
-                '--no-default-browser-check',
-                '--disable-extensions-except',
-                '--disable-plugins-discovery'
-            ]
-            
             # 启动浏览器 - 优先使用本地Chrome
             try:
                 if chrome_path:
@@ -842,20 +926,16 @@ class PlaywrightExecutor:
                         user_data_dir=str(user_data_path),
                         headless=self.headless,
                         executable_path=chrome_path,
-                        args=launch_args,
-                        viewport={'width': 1280, 'height': 720},
-                        locale='zh-CN',
-                        timezone_id='Asia/Shanghai'
+                        args=_LAUNCH_ARGS,
+                        **_CONTEXT_OPTIONS
                     )
                     logger.info("使用本地Chrome浏览器", chrome_path=chrome_path)
                 else:
                     self.browser = await self.playwright.chromium.launch_persistent_context(
                         user_data_dir=str(user_data_path),
                         headless=self.headless,
-                        args=launch_args,
-                        viewport={'width': 1280, 'height': 720},
-                        locale='zh-CN',
-                        timezone_id='Asia/Shanghai'
+                        args=_LAUNCH_ARGS,
+                        **_CONTEXT_OPTIONS
                     )
                     logger.info("使用Playwright内置Chromium")
             except Exception as e:
@@ -863,25 +943,28 @@ class PlaywrightExecutor:
                 self.browser = await self.playwright.chromium.launch_persistent_context(
                     user_data_dir=str(user_data_path),
                     headless=self.headless,
-                    args=launch_args,
+                    args=_LAUNCH_ARGS,
                     viewport={'width': 1280, 'height': 720}
                 )
             
             # 创建页面
             self.page = await self.browser.new_page()
-            
-            # 设置默认超时
-            self.page.set_default_timeout(self.timeout)
-            
-            # 设置用户代理，避免检测
-            await self.page.set_extra_http_headers({
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
+            await self._prepare_page(self.page)
             
             logger.info("浏览器环境初始化完成",
                        headless=self.headless,
                        user_data_dir=self.user_data_dir)
     
+    async def _prepare_page(self, page: Page) -> None:
+        """设置页面默认超时和请求头"""
+        # 设置默认超时
+        page.set_default_timeout(self.timeout)
+        
+        # 设置用户代理，避免检测
+        await page.set_extra_http_headers({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        })
+    
     def _get_chrome_path(self) -> Optional[str]:
         """获取本地Chrome浏览器路径"""
         import platform
@@ -1000,6 +1083,13 @@ class PlaywrightExecutor:
     
     async def _cleanup_browser(self) -> None:
         """清理浏览器环境"""
+        if not self._owns_browser:
+            # 借用的浏览器和页面由所属执行器负责关闭
+            self.page = None
+            self.browser = None
+            self.playwright = None
+            return
+        
         try:
             if self.page:
                 await self.page.close()
@@ -1,5 +1,6 @@
 """工作流录制器"""
 import asyncio
+import functools
 import json
 import uuid
 from pathlib import Path
@@ -10,11 +11,6 @@ from browser_use import Agent
 from browser_use.browser.browser import Browser
 from browser_use.browser.context import BrowserContext
 
-# 使用绝对导入避免相对导入问题
-import sys
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
 from src.core.config import config
 from src.models.workflow import Workflow, WorkflowStep, WorkflowVariable, StepType
 from src.utils.logger import logger
@@ -749,3 +745,35 @@ class WorkflowRecorder:
         except Exception as e:
             logger.error("工作流加载失败", workflow_name=workflow_name, error=str(e))
             return None
+
+
+@functools.lru_cache(maxsize=64)
+def _load_workflow_snapshot(output_dir: str, workflow_name: str, mtime_ns: int) -> Optional[Workflow]:
+    """按(目录, 名称, 文件修改时间)缓存已解析的工作流"""
+    return WorkflowRecorder(output_dir=output_dir).load_workflow(workflow_name)
+
+
+def load_workflow_cached(workflow_name: str, output_dir: Optional[str] = None) -> Optional[Workflow]:
+    """加载工作流（进程内缓存）
+    
+    同一进程内重复加载同一工作流时复用已解析的结果；文件被修改后自动失效。
+    返回深拷贝，调用方可以自由修改而不影响缓存。
+    
+    Args:
+        workflow_name: 工作流名称
+        output_dir: 工作流目录，默认使用配置中的目录
+    """
+    output_dir = str(output_dir or config.recording.output_dir)
+    workflow_file = Path(output_dir) / f"{workflow_name}.json"
+    try:
+        mtime_ns = workflow_file.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = -1
+    
+    workflow = _load_workflow_snapshot(output_dir, workflow_name, mtime_ns)
+    return workflow.model_copy(deep=True) if workflow else None
+
+
+def clear_workflow_cache() -> None:
+    """清空工作流缓存（录制新工作流后调用）"""
+    _load_workflow_snapshot.cache_clear()
@@ -1,14 +1,17 @@
 """Browser-Use 任务优化器"""
 import time
-from pathlib import Path
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 
 from langchain_openai import AzureChatOpenAI
 
 from .config import config
+from .._paths import PROJECT_ROOT
 from ..utils.logger import logger
 
+# 系统提示词文件
+PROMPT_FILE = PROJECT_ROOT / "task_optimizer_prompt.txt"
+
 
 @dataclass
 class OptimizationResult:
@@ -37,9 +40,7 @@ class TaskOptimizer:
     def _load_system_prompt(self) -> None:
         """从外部文件加载系统提示词"""
         try:
-            # 获取项目根目录
-            project_root = Path(__file__).parent.parent.parent
-            prompt_file = project_root / "task_optimizer_prompt.txt"
+            prompt_file = PROMPT_FILE
             
             if prompt_file.exists():
                 with open(prompt_file, 'r', encoding='utf-8') as f:
@@ -117,8 +118,7 @@ class TaskOptimizer:
         Returns:
             包含提示词信息的字典
         """
-        project_root = Path(__file__).parent.parent.parent
-        prompt_file = project_root / "task_optimizer_prompt.txt"
+        prompt_file = PROMPT_FILE
         
         return {
             "prompt_file": str(prompt_file),
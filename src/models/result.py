@@ -5,7 +5,7 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field
 
 
 class ExecutionStatus(str, Enum):
@@ -19,6 +19,13 @@ class ExecutionStatus(str, Enum):
     RETRYING = "retrying"        # 重试中
 
 
+# 视为已完成（无论成功失败）的执行状态
+_COMPLETED_STATUSES = frozenset((
+    ExecutionStatus.COMPLETED, ExecutionStatus.FAILED,
+    ExecutionStatus.CANCELLED, ExecutionStatus.TIMEOUT
+))
+
+
 class StepResult(BaseModel):
     """步骤执行结果"""
     step_id: str = Field(..., description="步骤ID")
@@ -134,20 +141,14 @@ class WorkflowExecutionResult(BaseModel):
         """是否执行成功"""
         return self.status == ExecutionStatus.COMPLETED
     
+    @computed_field
     @property
     def success_rate(self) -> float:
-        """成功率"""
+        """成功率（作为计算字段包含在model_dump/model_dump_json的输出中）"""
         if self.total_steps == 0:
             return 0.0
         return self.successful_steps / self.total_steps
     
-    def model_dump(self, **kwargs) -> Dict[str, Any]:
-        """重写model_dump方法，包含计算属性"""
-        data = super().model_dump(**kwargs)
-        # 添加计算属性
-        data['success_rate'] = self.success_rate
-        return data
-    
     def add_step_result(self, step_result: StepResult) -> None:
         """添加步骤结果"""
         self.step_results.append(step_result)
@@ -161,6 +162,18 @@ class WorkflowExecutionResult(BaseModel):
         elif step_result.status == ExecutionStatus.FAILED:
             self.failed_steps += 1
     
+    def add_step_results(self, step_results: List[StepResult]) -> None:
+        """批量添加步骤结果，统计规则与add_step_result一致"""
+        self.step_results.extend(step_results)
+        for step_result in step_results:
+            status = step_result.status
+            if status in _COMPLETED_STATUSES:
+                self.completed_steps += 1
+            if status == ExecutionStatus.COMPLETED:
+                self.successful_steps += 1
+            elif status == ExecutionStatus.FAILED:
+                self.failed_steps += 1
+    
     def get_step_result(self, step_id: str) -> Optional[StepResult]:
         """获取步骤结果"""
         for result in self.step_results:
@@ -239,12 +252,24 @@ class BatchExecutionResult(BaseModel):
     # 元数据
     metadata: Dict[str, Any] = Field(default_factory=dict, description="额外元数据")
     
+    # 失败执行结果缓存（随 add_execution_result 维护，不参与序列化）
+    _failed_results: List[WorkflowExecutionResult] = PrivateAttr(default_factory=list)
+    
+    def model_post_init(self, __context: Any) -> None:
+        """从已有执行结果（如从文件加载）初始化失败结果缓存"""
+        self._failed_results = [r for r in self.execution_results if not r.is_successful]
+    
     @property
     def is_completed(self) -> bool:
         """是否已完成"""
         return self.status in [ExecutionStatus.COMPLETED, ExecutionStatus.FAILED, 
                               ExecutionStatus.CANCELLED, ExecutionStatus.TIMEOUT]
     
+    @property
+    def failed_results(self) -> List[WorkflowExecutionResult]:
+        """失败的执行结果"""
+        return self._failed_results
+    
     @property
     def success_rate(self) -> float:
         """成功率"""
@@ -259,6 +284,7 @@ class BatchExecutionResult(BaseModel):
             self.completed_executions += 1
         else:
             self.failed_executions += 1
+            self._failed_results.append(execution_result)
     
     def mark_completed(self) -> None:
         """标记为完成"""
@@ -312,6 +338,16 @@ class ExecutionHistory:
         file_path = self.history_dir / filename
         result.save_to_file(file_path)
     
+    def save_execution_results(self, results: List[WorkflowExecutionResult]):
+        """保存多个执行结果
+        
+        执行历史按文件列出，每个结果仍写入各自的文件，只是共用同一时间戳。
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        for result in results:
+            filename = f"{result.workflow_name}_{result.execution_id}_{timestamp}.json"
+            result.save_to_file(self.history_dir / filename)
+    
     def save_batch_result(self, result: BatchExecutionResult):
         """保存批量执行结果"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -340,7 +376,8 @@ class ExecutionHistory:
                     'start_time': data.get('start_time'),
                     'duration': data.get('duration'),
                     'success_rate': data.get('success_rate', 0),
-                    'is_batch': 'batch_id' in data
+                    'is_batch': 'batch_id' in data,
+                    'cached': data.get('metadata', {}).get('cached', False)
                 })
             except Exception:
                 continue
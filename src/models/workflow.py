@@ -1,12 +1,32 @@
 """工作流数据模型"""
+import ast
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Union
 
+import orjson
 from pydantic import BaseModel, Field
 
 
+@lru_cache(maxsize=1024)
+def parse_step_value(value: str) -> Any:
+    """解析步骤值（JSON或Python字面量），无法解析时返回None
+    
+    结果会被缓存并在调用方之间共享，调用方不应修改返回的对象。
+    """
+    if value.lstrip()[:1] in ("{", "["):
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            pass
+    try:
+        return ast.literal_eval(value)
+    except Exception:
+        return None
+
+
 class StepType(str, Enum):
     """步骤类型枚举"""
     NAVIGATE = "navigate"
@@ -45,6 +65,11 @@ class WorkflowStep(BaseModel):
     screenshot_path: Optional[str] = Field(None, description="截图路径")
     created_at: datetime = Field(default_factory=datetime.now)
     metadata: Dict[str, Any] = Field(default_factory=dict, description="额外元数据")
+    
+    @property
+    def display_target(self) -> str:
+        """用于展示的步骤目标（URL、选择器或输入值）"""
+        return self.url or self.selector or self.value or ""
 
 
 class WorkflowVariable(BaseModel):
@@ -71,6 +96,7 @@ class Workflow(BaseModel):
     timeout: int = Field(30000, description="默认超时时间(毫秒)")
     retry_count: int = Field(3, description="重试次数")
     parallel: bool = Field(False, description="是否支持并行执行")
+    cacheable: bool = Field(False, description="相同输入下结果是否可复用（纯函数式工作流）")
     
     # 元数据
     tags: List[str] = Field(default_factory=list, description="标签")
@@ -78,6 +104,14 @@ class Workflow(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     
+    @property
+    def required_variable_names(self) -> Set[str]:
+        """必须由调用方提供的变量名（必填且没有默认值）"""
+        return {
+            name for name, var in self.variables.items()
+            if var.required and var.default is None
+        }
+    
     def add_step(self, step: WorkflowStep) -> None:
         """添加步骤"""
         self.steps.append(step)
@@ -113,15 +147,15 @@ class Workflow(BaseModel):
         """从字典创建工作流"""
         return cls(**data)
     
+    def to_json(self) -> bytes:
+        """序列化为UTF-8编码的JSON（与save_to_file的文件格式一致）"""
+        return orjson.dumps(self.to_dict(), default=str, option=orjson.OPT_INDENT_2)
+    
     def save_to_file(self, file_path: Union[str, Path]) -> None:
         """保存到文件"""
-        import json
-        
         file_path = Path(file_path)
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2, default=str)
+        file_path.write_bytes(self.to_json())
     
     @classmethod
     def load_from_file(cls, file_path: Union[str, Path]) -> "Workflow":
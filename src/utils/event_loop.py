@@ -0,0 +1,20 @@
+"""事件循环工具模块"""
+import asyncio
+from typing import Any, Callable, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def _loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """优先使用uvloop事件循环，不可用时（如Windows）返回None使用默认循环"""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """运行协程直至完成，等价于asyncio.run，但在可用时使用uvloop"""
+    with asyncio.Runner(loop_factory=_loop_factory()) as runner:
+        return runner.run(coro)
@@ -1,4 +1,5 @@
 """Web UI应用 - 工作流查看和编辑界面"""
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Dict, List, Optional
 import asyncio
@@ -11,7 +12,7 @@ from pydantic import BaseModel
 
 from ..core.recorder import WorkflowRecorder
 from ..core.executor import PlaywrightExecutor, task_manager
-from ..core.browser_use_executor import HybridExecutor
+from ..core.browser_use_executor import BrowserUseExecutor, HybridExecutor, flush_execution_history
 from ..core.task_optimizer import task_optimizer, OptimizationResult
 from ..models.workflow import Workflow, WorkflowStep, StepType
 from ..models.result import ExecutionStatus, execution_history
@@ -19,11 +20,32 @@ from ..utils.cleaner import ScriptCleaner
 from ..utils.logger import logger
 from .template_manager import get_template_manager
 
+async def _warmup_browser_use() -> None:
+    """后台预热Browser-Use执行器，失败时仅记录日志（首次执行时会重新创建）"""
+    try:
+        await BrowserUseExecutor.warmup()
+    except Exception as e:
+        logger.warning("Browser-Use执行器预热失败", error=str(e))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动时后台预热Browser-Use执行器，关闭时写完排队中的执行历史"""
+    warmup_task = asyncio.create_task(_warmup_browser_use())
+    try:
+        yield
+    finally:
+        if not warmup_task.done():
+            warmup_task.cancel()
+        await flush_execution_history()
+
+
 # 创建FastAPI应用
 app = FastAPI(
     title="Browser-Use-Playwright Web UI",
     description="工作流查看和编辑界面",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # 初始化模板管理器
@@ -0,0 +1,112 @@
+"""Browser-Use转换器测试"""
+
+import ast
+import time
+
+import pytest
+from structlog.testing import capture_logs
+
+from src.core import browser_use_converter as converter_module
+from src.core.browser_use_converter import BrowserUseConverter, _fast_literal
+from src.models.workflow import StepType, WorkflowStep
+
+
+def _custom_step(value: str) -> WorkflowStep:
+    return WorkflowStep(id="step_1", type=StepType.CUSTOM, value=value)
+
+
+def test_scroll_with_invalid_amount_falls_back():
+    """滚动距离不是整数时不能生成SCROLL步骤，应回退为备用步骤"""
+    converter = BrowserUseConverter()
+    
+    steps = converter.convert_step(_custom_step("{'scroll_down': {'amount': 'x'}}"))
+    
+    assert len(steps) == 1
+    assert steps[0].type == StepType.CUSTOM
+    assert steps[0].metadata["conversion_failed"] is True
+    assert steps[0].metadata["browser_use_operation"] == "scroll_down"
+    # 备用步骤的值保持Python字面量格式，与已保存的工作流一致
+    assert steps[0].value == "{'amount': 'x'}"
+
+
+def test_scroll_with_valid_amount():
+    converter = BrowserUseConverter()
+    
+    steps = converter.convert_step(_custom_step("{'scroll_down': {'amount': 300}}"))
+    
+    assert len(steps) == 1
+    assert steps[0].type == StepType.SCROLL
+    assert steps[0].scroll_amount == 300
+    assert steps[0].scroll_direction == "down"
+
+
+def test_cache_hit_rebinds_ids_and_repeats_warnings():
+    """相同步骤值命中缓存时，步骤ID按新步骤重新生成，不支持的操作仍然告警"""
+    converter = BrowserUseConverter()
+    value = "{'go_back': {}, 'wait': {'timeout': 100}}"
+    
+    first = converter.convert_step(WorkflowStep(id="a", type=StepType.CUSTOM, value=value))
+    with capture_logs() as logs:
+        second = converter.convert_step(WorkflowStep(id="b", type=StepType.CUSTOM, value=value))
+    
+    assert [s.id for s in first] == ["a_fallback_0", "a_wait_1"]
+    assert [s.id for s in second] == ["b_fallback_0", "b_wait_1"]
+    assert second[1].metadata["original_step_id"] == "b"
+    events = [(log["event"], log.get("step_id", log.get("original_step_id"))) for log in logs]
+    assert ("不支持的操作类型", "b") in events
+    assert ("步骤转换成功", "b") in events
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    """缓存满时只淘汰最久未使用的条目"""
+    monkeypatch.setattr(converter_module, "_CONVERT_CACHE_SIZE", 2)
+    converter = BrowserUseConverter()
+    values = [f"{{'wait': {{'timeout': {n}}}}}" for n in (1, 2, 3)]
+    
+    converter.convert_step(_custom_step(values[0]))
+    converter.convert_step(_custom_step(values[1]))
+    converter.convert_step(_custom_step(values[0]))
+    converter.convert_step(_custom_step(values[2]))
+    
+    assert list(converter._convert_cache) == [values[0], values[2]]
+
+
+@pytest.mark.parametrize("text", [
+    "{'open_tab': {'url': 'https://www.douban.com'}}",
+    "{'input_text': {'index': 10, 'text': 'it is True'}}",
+    "{'open_tab': {'url': 'https://example.com/?flag=True&x=None'}}",
+    "{'done': {'text': 'title: \"代码整洁之道\"', 'success': True}}",
+    "{'input_text': {'text': 'it\\'s done', 'index': 3}}",
+    "{'scroll_down': {'amount': None}, 'wait': {'timeout': 1.5e3}}",
+    "{'done': {'success': False, 'text': 'None of them'}, 'interacted_element': [None, {'a': {'b': [1, -2]}}]}",
+    "{'switch_tab': {'page_id': 1,}}",
+    "{'extract_content': {'goal': 'rating', 'should_strip_link_urls': True}}",
+])
+def test_fast_literal_matches_literal_eval(text):
+    """快速路径的解析结果与ast.literal_eval完全一致（包括布尔值与整数的区别）"""
+    assert repr(_fast_literal(text)) == repr(ast.literal_eval(text))
+
+
+@pytest.mark.parametrize("text", [
+    "{'amount': NaN}",
+    "{'amount': Infinity}",
+    "{'amount': -Infinity}",
+    "{'success': true}",
+    "{'value': null}",
+])
+def test_fast_literal_rejects_non_python_literals(text):
+    """JSON可以解析但不是Python字面量的文本同样被拒绝"""
+    with pytest.raises(ValueError):
+        _fast_literal(text)
+
+
+def test_cache_hit_steps_get_new_created_at():
+    """命中缓存的步骤使用本次转换的创建时间"""
+    converter = BrowserUseConverter()
+    value = "{'wait': {'timeout': 100}}"
+    
+    first = converter.convert_step(WorkflowStep(id="a", type=StepType.CUSTOM, value=value))
+    time.sleep(0.01)
+    second = converter.convert_step(WorkflowStep(id="b", type=StepType.CUSTOM, value=value))
+    
+    assert second[0].created_at > first[0].created_at
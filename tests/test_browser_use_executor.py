@@ -0,0 +1,158 @@
+"""Browser-Use执行器测试"""
+
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+pytest.importorskip("jinja2")
+
+from src.core import browser_use_executor as executor_module
+from src.core.browser_use_executor import BrowserUseExecutor, flush_execution_history
+from src.models.result import ExecutionHistory, ExecutionStatus
+from src.models.workflow import StepType, Workflow, WorkflowStep
+
+
+class FakeAgent:
+    """记录运行次数的Browser-Use Agent替身"""
+    runs = 0
+
+    async def run(self, max_steps):
+        FakeAgent.runs += 1
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    """将执行历史写入临时目录，并清空结果缓存"""
+    history = ExecutionHistory(tmp_path)
+    monkeypatch.setattr(executor_module, "execution_history", history)
+    monkeypatch.setattr(BrowserUseExecutor, "_result_cache", OrderedDict())
+    return history
+
+
+@pytest.fixture
+def fake_agent(monkeypatch):
+    async def initialize_agent(self, task_description):
+        self.agent = FakeAgent()
+
+    FakeAgent.runs = 0
+    monkeypatch.setattr(BrowserUseExecutor, "_initialize_agent", initialize_agent)
+
+
+def _workflow(cacheable: bool) -> Workflow:
+    return Workflow(
+        name="cache_test",
+        description="测试任务",
+        cacheable=cacheable,
+        steps=[WorkflowStep(id="step_1", type=StepType.CUSTOM, value="{'done': {'text': 'ok'}}")]
+    )
+
+
+async def test_cache_hit_is_marked_and_skips_agent(history, fake_agent):
+    """可缓存的工作流在相同输入下第二次执行命中缓存，不再运行Agent"""
+    executor = BrowserUseExecutor(headless=True)
+    workflow = _workflow(cacheable=True)
+
+    first = await executor.execute_workflow(workflow, {"q": "a"}, "exec_1")
+    second = await executor.execute_workflow(workflow, {"q": "a"}, "exec_2")
+    await flush_execution_history()
+
+    assert FakeAgent.runs == 1
+    assert "cached" not in first.metadata
+    assert second.execution_id == "exec_2"
+    assert second.metadata["cached"] is True
+    assert second.metadata["cached_execution_id"] == "exec_1"
+    cached_flags = sorted(h["cached"] for h in history.get_execution_history())
+    assert cached_flags == [False, True]
+
+
+async def test_cache_miss_on_different_inputs(history, fake_agent):
+    executor = BrowserUseExecutor(headless=True)
+    workflow = _workflow(cacheable=True)
+
+    await executor.execute_workflow(workflow, {"q": "a"}, "exec_1")
+    result = await executor.execute_workflow(workflow, {"q": "b"}, "exec_2")
+
+    assert FakeAgent.runs == 2
+    assert "cached" not in result.metadata
+
+
+async def test_cache_miss_on_changed_description_or_settings(history, fake_agent):
+    """任务描述或执行器设置变化时不复用缓存结果"""
+    workflow = _workflow(cacheable=True)
+    edited = workflow.model_copy(update={"description": "修改后的任务"})
+
+    await BrowserUseExecutor(headless=True).execute_workflow(workflow, {"q": "a"}, "exec_1")
+    by_description = await BrowserUseExecutor(headless=True).execute_workflow(edited, {"q": "a"}, "exec_2")
+    by_headless = await BrowserUseExecutor(headless=False).execute_workflow(workflow, {"q": "a"}, "exec_3")
+
+    assert FakeAgent.runs == 3
+    assert "cached" not in by_description.metadata
+    assert "cached" not in by_headless.metadata
+
+async def test_non_cacheable_workflow_always_runs(history, fake_agent):
+    executor = BrowserUseExecutor(headless=True)
+    workflow = _workflow(cacheable=False)
+
+    await executor.execute_workflow(workflow, {"q": "a"}, "exec_1")
+    result = await executor.execute_workflow(workflow, {"q": "a"}, "exec_2")
+
+    assert FakeAgent.runs == 2
+    assert result.status == ExecutionStatus.COMPLETED
+    assert "cached" not in result.metadata
+    assert not BrowserUseExecutor._result_cache
+
+
+async def test_flush_writes_queued_history(history, fake_agent):
+    """执行历史在后台写入，flush之后每次执行对应一个已完成的历史文件"""
+    executor = BrowserUseExecutor(headless=True)
+
+    await executor.execute_workflow(_workflow(cacheable=False), {}, "exec_1")
+    await executor.execute_workflow(_workflow(cacheable=False), {}, "exec_2")
+    await flush_execution_history()
+
+    records = history.get_execution_history()
+    assert sorted(r["execution_id"] for r in records) == ["exec_1", "exec_2"]
+    assert all(r["status"] == ExecutionStatus.COMPLETED.value for r in records)
+
+
+async def test_hybrid_cleanup_flushes_history(history, fake_agent):
+    """混合执行器清理时等待执行历史写入（TaskManager的执行路径）"""
+    pytest.importorskip("browser_use")
+    from src.core.browser_use_executor import HybridExecutor
+
+    executor = HybridExecutor(headless=True)
+    await executor.execute_workflow(_workflow(cacheable=False), {}, "exec_1")
+    await executor.cleanup()
+
+    assert [r["execution_id"] for r in history.get_execution_history()] == ["exec_1"]
+
+
+async def test_cancelled_run_saves_one_cancelled_history(history, monkeypatch):
+    """Agent运行中被取消时，执行结果标记为已取消并只保存一次"""
+    started = asyncio.Event()
+
+    class BlockingAgent:
+        async def run(self, max_steps):
+            started.set()
+            await asyncio.Event().wait()
+
+    async def initialize_agent(self, task_description):
+        self.agent = BlockingAgent()
+
+    monkeypatch.setattr(BrowserUseExecutor, "_initialize_agent", initialize_agent)
+    executor = BrowserUseExecutor(headless=True)
+
+    task = asyncio.create_task(executor.execute_workflow(_workflow(cacheable=False), {}, "exec_1"))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await flush_execution_history()
+
+    records = history.get_execution_history()
+    assert len(records) == 1
+    detail = history.get_execution_detail(records[0]["filename"])
+    assert detail["status"] == ExecutionStatus.CANCELLED.value
+    assert detail["end_time"] is not None
+    assert detail["error_message"] == "执行被取消"
@@ -0,0 +1,46 @@
+"""配置模块测试"""
+
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+import src.core.config as config_module
+
+
+def _load_fresh_config_module():
+    """重新执行config.py，得到一个独立的模块对象（不影响已导入的src.core.config）"""
+    spec = importlib.util.spec_from_file_location("_fresh_config", config_module.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_dotenv_loaded_at_import_and_config_created_lazily(monkeypatch):
+    """.env在导入时加载，全局配置在首次访问时才创建"""
+    monkeypatch.delenv("AZURE_OPENAI_MODEL", raising=False)
+    fake_dotenv = types.ModuleType("dotenv")
+    fake_dotenv.load_dotenv = lambda: monkeypatch.setenv("AZURE_OPENAI_MODEL", "from-dotenv")
+    monkeypatch.setitem(sys.modules, "dotenv", fake_dotenv)
+
+    module = _load_fresh_config_module()
+
+    # 直接读取os.environ的代码在访问config之前就能看到.env中的值
+    assert os.environ["AZURE_OPENAI_MODEL"] == "from-dotenv"
+    assert "config" not in vars(module)
+
+    config = module.config
+
+    assert config.recording.browser_use.azure_openai.model == "from-dotenv"
+    # 创建后写回模块命名空间，后续访问返回同一实例
+    assert vars(module)["config"] is config
+    assert module.config is config
+
+
+def test_unknown_attribute_raises():
+    module = _load_fresh_config_module()
+
+    with pytest.raises(AttributeError):
+        module.missing
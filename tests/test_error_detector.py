@@ -0,0 +1,41 @@
+"""错误检测器测试"""
+
+import asyncio
+
+from src.core.error_detector import ErrorDetector
+
+
+class FakePage:
+    """页面替身：标题获取被取消，其余捕获正常完成"""
+    url = "https://example.com/"
+    viewport_size = {"width": 1280, "height": 720}
+
+    async def title(self):
+        raise asyncio.CancelledError()
+
+    async def evaluate(self, expression):
+        return "FakeAgent/1.0"
+
+    async def screenshot(self, path, full_page):
+        pass
+
+    async def content(self):
+        return "<html></html>"
+
+
+async def test_cancelled_probe_is_not_stored_as_context_value(tmp_path):
+    """被取消的捕获项记为None，不会把CancelledError写入错误上下文"""
+    detector = ErrorDetector(screenshot_dir=tmp_path / "screenshots", dom_dir=tmp_path / "dom")
+
+    context = await detector.capture_error_context(
+        TimeoutError("Timeout 30000ms exceeded"),
+        step={"type": "click"},
+        step_index=0,
+        workflow_path="workflow.json",
+        page=FakePage()
+    )
+
+    assert context.page_url == "https://example.com/"
+    assert context.page_title is None
+    assert context.user_agent == "FakeAgent/1.0"
+    assert context.dom_snapshot is not None
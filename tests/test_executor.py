@@ -0,0 +1,90 @@
+"""Playwright执行器批量执行测试"""
+
+import pytest
+
+pytest.importorskip("playwright")
+pytest.importorskip("browser_use")
+
+from src.core.executor import PlaywrightExecutor
+from src.models.result import ExecutionStatus, WorkflowExecutionResult
+from src.models.workflow import Workflow
+
+
+class FakePage:
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def set_extra_http_headers(self, headers):
+        pass
+
+
+class FakeContext:
+    def __init__(self, storage_state=None):
+        self.storage_state = storage_state
+        self.cookies = {}
+        self.closed = False
+
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.closed = False
+
+    async def new_context(self, storage_state=None, **options):
+        context = FakeContext(storage_state)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePlaywright:
+    async def stop(self):
+        pass
+
+
+async def test_batch_tasks_run_in_isolated_contexts(monkeypatch):
+    """批量执行的每个任务使用独立的浏览器上下文（从用户数据目录的状态开始），任务结束后关闭"""
+    browser = FakeBrowser()
+    profile_state = {'cookies': [{'name': 'session', 'value': 'x'}], 'origins': []}
+    seen = []
+
+    async def fake_start(self):
+        self.playwright = FakePlaywright()
+        self.browser = browser
+        return profile_state
+
+    async def fake_execute(self, workflow, input_variables=None, execution_id=None):
+        # 记录任务开始时上下文中已有的Cookie，然后写入本任务的Cookie
+        seen.append(dict(self.context.cookies))
+        self.context.cookies['user'] = input_variables['user']
+        result = WorkflowExecutionResult(
+            workflow_name=workflow.name,
+            execution_id=execution_id,
+            status=ExecutionStatus.COMPLETED
+        )
+        return result
+
+    monkeypatch.setattr(PlaywrightExecutor, '_start_batch_browser', fake_start)
+    monkeypatch.setattr(PlaywrightExecutor, 'execute_workflow', fake_execute)
+
+    executor = PlaywrightExecutor(headless=True, enable_healing=False)
+    batch_result = await executor.execute_batch(
+        Workflow(name="batch"),
+        [{'user': 'a'}, {'user': 'b'}, {'user': 'c'}],
+        concurrent_limit=2
+    )
+
+    assert batch_result.total_executions == 3
+    assert len(browser.contexts) == 3
+    assert all(context.closed for context in browser.contexts)
+    assert all(context.storage_state is profile_state for context in browser.contexts)
+    assert seen == [{}, {}, {}]
+    assert browser.closed
@@ -0,0 +1,75 @@
+"""录制命令测试"""
+
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("browser_use")
+
+from src.cli import record
+
+
+def _blocking_input(release: threading.Event):
+    """模拟一直等不到用户输入的input()"""
+    def fake_input(*args):
+        release.wait()
+        return ""
+    return fake_input
+
+
+def test_cancelled_wait_does_not_block_loop_shutdown(monkeypatch):
+    """取消等待后事件循环可以立即关闭，不需要等用户按Enter"""
+    release = threading.Event()
+    monkeypatch.setattr("builtins.input", _blocking_input(release))
+
+    async def main():
+        waiter = asyncio.create_task(record._wait_for_enter())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    try:
+        done = threading.Event()
+        runner = threading.Thread(target=lambda: (asyncio.run(main()), done.set()), daemon=True)
+        runner.start()
+        assert done.wait(timeout=5)
+    finally:
+        release.set()
+
+
+async def test_enter_resolves_wait(monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda *args: "")
+
+    await asyncio.wait_for(record._wait_for_enter(), timeout=5)
+
+
+async def test_interrupted_recording_is_still_saved(monkeypatch, tmp_path):
+    """等待输入时被取消，录制仍会停止并保存"""
+    release = threading.Event()
+    monkeypatch.setattr("builtins.input", _blocking_input(release))
+    stopped = []
+
+    class FakeRecorder:
+        def __init__(self, output_dir):
+            pass
+
+        async def interactive_recording(self, name, description):
+            return None
+
+        async def stop_recording(self, save=True):
+            stopped.append(save)
+
+    monkeypatch.setattr(record, "WorkflowRecorder", FakeRecorder)
+
+    task = asyncio.create_task(record.record_workflow("demo", output=str(tmp_path)))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    try:
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    finally:
+        release.set()
+
+    assert stopped == [True]